@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
-import os, sys, json, asyncio, aiohttp, re, anthropic, markdown, time, platform, pickle
+import os, sys, json, asyncio, aiohttp, re, anthropic, markdown, time, platform, pickle, io, hashlib, sqlite3
 from urllib.parse import urlparse
+from operator import itemgetter
+from collections import OrderedDict, deque
+from html import escape as _html_escape
 
 try:
     import speech_recognition as sr
@@ -15,18 +18,42 @@ try:
 except ImportError:
     pyaudio = None
 
-_DOMAIN_TOKEN_PATTERN = re.compile(r"\|\|([a-z0-9*_.-]+)")
-_PLAIN_DOMAIN_PATTERN = re.compile(r"([a-z0-9-]+(?:\.[a-z0-9-]+)+)")
+try:
+    import marisa_trie
+except ImportError:
+    marisa_trie = None
 
-import argparse, concurrent.futures, threading
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-from PyQt6.QtCore import QUrl, Qt, QDateTime, QThread, pyqtSignal, QObject, QStandardPaths, QTimer, QSize, QCoreApplication
-from PyQt6.QtWidgets import QApplication, QMainWindow, QLineEdit, QTabWidget, QToolBar, QMessageBox, QMenu, QDialog, QVBoxLayout, QLabel, QListWidget, QListWidgetItem, QPushButton, QHBoxLayout, QColorDialog, QFontDialog, QProgressBar, QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QCheckBox, QSpinBox, QComboBox, QSlider, QGroupBox, QGridLayout, QScrollArea, QTextEdit, QFrame, QWidget, QSplitter, QSizePolicy
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+_DOMAIN_TOKEN_PATTERN = re.compile(r"\|\|([a-z0-9*_.-]+)")
+_PLAIN_DOMAIN_PATTERN = re.compile(r"([a-z0-9-]+(?:\.[a-z0-9-]+)+)")
+_INVALID_DOMAIN_CHARS = re.compile(r"[^a-z0-9.-]")
+# Netscape bookmark export anchors; bytes pattern so it can scan an mmap'd file directly
+_NETSCAPE_ANCHOR_RE = re.compile(rb'<a[^>]*href="([^"]+)"[^>]*>(.*?)</a>', re.IGNORECASE | re.DOTALL)
+_TAG_STRIP_RE = re.compile(r'<[^>]+>')
+# Bookmark exports at least this large are parsed with selectolax (when installed) instead of the regex
+_SELECTOLAX_MIN_BYTES = 1 << 20
+# Escapes for the Netscape bookmark export: element text, and the double-quoted HREF value
+_NETSCAPE_TEXT_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+_NETSCAPE_HREF_ESCAPE = str.maketrans({'"': '&quot;'})
+
+import argparse, concurrent.futures, threading, bisect, itertools, mmap, struct, zlib, functools, heapq
+
+from PyQt6.QtCore import QUrl, Qt, QDateTime, QThread, pyqtSignal, QObject, QStandardPaths, QTimer, QSize, QCoreApplication, QAbstractListModel, QSortFilterProxyModel, QModelIndex, QByteArray, QBuffer, QIODevice, QSaveFile
+from PyQt6.QtWidgets import QApplication, QMainWindow, QLineEdit, QTabWidget, QToolBar, QMessageBox, QMenu, QDialog, QVBoxLayout, QLabel, QListWidget, QListWidgetItem, QPushButton, QHBoxLayout, QColorDialog, QFontDialog, QProgressBar, QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QCheckBox, QSpinBox, QComboBox, QSlider, QGroupBox, QGridLayout, QScrollArea, QTextEdit, QFrame, QWidget, QSplitter, QSizePolicy, QListView
 from PyQt6.QtPrintSupport import QPrinter, QPrintDialog
-from PyQt6.QtGui import QIcon, QPixmap, QAction, QKeySequence, QShortcut, QColor, QFont, QStandardItemModel, QStandardItem, QImage, QImageWriter
+from PyQt6.QtGui import QIcon, QPixmap, QAction, QKeySequence, QShortcut, QColor, QFont, QImage, QImageReader, QTextCursor, QPixmapCache
 from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtNetwork import QNetworkCookie, QNetworkProxy, QNetworkAccessManager, QNetworkRequest, QLocalServer, QLocalSocket
-from PyQt6.QtWebEngineCore import QWebEngineUrlRequestInterceptor, QWebEngineProfile, QWebEngineSettings
+from PyQt6.QtNetwork import QNetworkCookie, QNetworkProxy, QNetworkAccessManager, QNetworkRequest, QNetworkDiskCache, QLocalServer, QLocalSocket
+from PyQt6.QtWebEngineCore import QWebEngineUrlRequestInterceptor, QWebEngineProfile, QWebEngineSettings, QWebEngineScript
 
 try:  # QWebEngineContextMenuData is missing on older PyQt6 builds (e.g., Debian stable)
     from PyQt6.QtWebEngineCore import QWebEngineContextMenuData  # type: ignore
@@ -37,24 +64,6 @@ from adblockparser import AdblockRules
 
 # --- Multi-core / thread pool utilities ------------------------------------------------------
 
-def _markdown_convert_task(text: str, enable_markdown: bool):
-    """Isolated task function executed in a separate process for heavy markdown conversion.
-    We re-import modules inside the process space to avoid large object pickling overhead.
-    Returns HTML string.
-    """
-    try:
-        if enable_markdown:
-            try:
-                import markdown as _md
-                return _md.markdown(text, extensions=['fenced_code'])
-            except Exception:
-                pass
-        # Fallback simple escaping if markdown fails inside worker
-        import html
-        return '<pre>' + html.escape(text) + '</pre>'
-    except Exception as e:
-        return f"<pre>Markdown render error: {e}</pre>"
-
 class IOPool:
     """Thread-based executor for background work to keep the UI responsive."""
     def __init__(self, workers: int | None = None):
@@ -104,6 +113,15 @@ class IOPool:
             self._executor = None
             with self._lock:
                 self._futures.clear()
+
+_SHARED_IO_POOL: IOPool | None = None
+
+def _get_shared_io_pool(workers: int | None = None) -> IOPool:
+    """Process-wide IOPool, created on first use and reused by every Browser window."""
+    global _SHARED_IO_POOL
+    if _SHARED_IO_POOL is None or _SHARED_IO_POOL._executor is None:
+        _SHARED_IO_POOL = IOPool(workers)
+    return _SHARED_IO_POOL
                 
 # --- Network request interceptor with ad-blocking ------------------------------------------
 
@@ -596,6 +614,162 @@ class SettingsManager:
             print(f"Failed to import settings: {e}")
             return False
 
+# --- Cookie list model ------------------------------------------------------------------------
+
+class CookieListModel(QAbstractListModel):
+    """Read-only model over cookie dicts; row text is only formatted when Qt asks for it."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cookies = []
+        self._names = []
+        self._domains = []
+
+    def set_cookies(self, cookies):
+        self.beginResetModel()
+        self._cookies = list(cookies)
+        get = dict.get
+        self._names = [get(c, 'name', 'Unknown') for c in self._cookies]
+        self._domains = [get(c, 'domain', 'Unknown domain') for c in self._cookies]
+        self.endResetModel()
+
+    def cookie_at(self, row: int):
+        if 0 <= row < len(self._cookies):
+            return self._cookies[row]
+        return None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._cookies)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{self._names[row]} - {self._domains[row]}"
+        if role == Qt.ItemDataRole.UserRole:
+            return self._cookies[row]
+        return None
+
+# --- URL entry list model ---------------------------------------------------------------------
+
+class UrlEntryListModel(QAbstractListModel):
+    """Read-only model over (title, url) entries for the History/Bookmarks menus.
+    Favicons are requested from favicon_provider(url, callback) only when a row is painted,
+    once per favicon_key(url) (the host), so rows sharing a site share one lookup.
+    """
+    def __init__(self, favicon_provider=None, favicon_key=None, parent=None):
+        super().__init__(parent)
+        self._entries: list[tuple[str, str]] = []
+        self._haystacks: list[str] = []
+        self._icons: dict[str, QIcon] = {}
+        self._requested: set[str] = set()
+        self._keys: dict[str, str] = {}
+        self._favicon_provider = favicon_provider
+        self._favicon_key = favicon_key
+        self._resolving = None
+
+    def set_entries(self, entries):
+        self.beginResetModel()
+        self._entries = [(title, url) for title, url in entries]
+        # Lower-cased title and url per row (newline-joined so a query can't span both),
+        # computed once per reset for the search filter
+        self._haystacks = [f"{title}\n{url}".lower() if title else url.lower() for title, url in self._entries]
+        keys = self._keys
+        self._keys = {url: keys[url] for _, url in self._entries if url in keys}
+        self.endResetModel()
+
+    def haystack(self, row: int) -> str:
+        return self._haystacks[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._entries)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        title, url = self._entries[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{title} — {url}" if title else url
+        if role == Qt.ItemDataRole.UserRole:
+            return url
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._icon_for(url)
+        return None
+
+    def _key_for(self, url: str) -> str:
+        key = self._keys.get(url)
+        if key is None:
+            key = self._favicon_key(url) if self._favicon_key is not None else url
+            self._keys[url] = key
+        return key
+
+    def _icon_for(self, url: str):
+        key = self._key_for(url)
+        icon = self._icons.get(key)
+        if icon is not None or self._favicon_provider is None or key in self._requested:
+            return icon
+        self._requested.add(key)
+        self._resolving = key
+        try:
+            self._favicon_provider(url, lambda ic, k=key: self._on_icon(k, ic))
+        except Exception:
+            pass
+        finally:
+            self._resolving = None
+        return self._icons.get(key)
+
+    def _on_icon(self, key: str, icon):
+        self._icons[key] = icon
+        # Cache hits resolve inside data(); only late (fetched) icons need a repaint
+        if key != self._resolving and self._entries:
+            self.dataChanged.emit(self.index(0), self.index(len(self._entries) - 1), [Qt.ItemDataRole.DecorationRole])
+
+# Completer role holding the pre-lowered "title\nurl" text the URL bar filters on
+_COMPLETION_FILTER_ROLE = Qt.ItemDataRole.UserRole.value + 1
+
+class UrlCompletionModel(UrlEntryListModel):
+    """URL bar completer model over (label, url, haystack) rows; the label is shown verbatim,
+    the haystack is exposed as _COMPLETION_FILTER_ROLE, and favicons load lazily per host,
+    only for the rows the completer popup actually paints.
+    """
+    def set_entries(self, entries):
+        self.beginResetModel()
+        self._entries = [(label, url) for label, url, _ in entries]
+        self._haystacks = [haystack for _, _, haystack in entries]
+        keys = self._keys
+        self._keys = {url: keys[url] for _, url in self._entries if url in keys}
+        self.endResetModel()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        label, url = self._entries[index.row()]
+        # QCompleter matches on EditRole by default
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return label
+        if role == Qt.ItemDataRole.UserRole:
+            return url
+        if role == _COMPLETION_FILTER_ROLE:
+            return self._haystacks[index.row()]
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._icon_for(url)
+        return None
+
+class UrlEntryFilterProxy(QSortFilterProxyModel):
+    """Substring filter over UrlEntryListModel rows using the model's pre-lowered haystacks."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+
+    def set_needle(self, text: str):
+        needle = (text or "").lower()
+        if needle != self._needle:
+            self._needle = needle
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return not self._needle or self._needle in self.sourceModel().haystack(source_row)
+
 # --- Advanced Settings Dialog -----------------------------------------------------------------
 
 class AdvancedSettingsDialog(QDialog):
@@ -1293,7 +1467,10 @@ class AdvancedSettingsDialog(QDialog):
         cookies_layout = QVBoxLayout(cookies_group)
 
         # Cookies list with individual delete options
-        self.cookies_list = QListWidget()
+        self.cookies_list = QListView()
+        self._cookie_model = CookieListModel(self)
+        self.cookies_list.setModel(self._cookie_model)
+        self.cookies_list.setUniformItemSizes(True)
         self.cookies_list.setMaximumHeight(200)
         self._populate_cookies_list()
         cookies_layout.addWidget(self.cookies_list)
@@ -1457,7 +1634,8 @@ class AdvancedSettingsDialog(QDialog):
         """Populate the history list widget"""
         if hasattr(self.parent_browser, 'history'):
             self.history_list.clear()
-            for title, url in self.parent_browser.history[-50:]:  # Last 50 entries
+            history = self.parent_browser.history
+            for title, url in itertools.islice(history, max(0, len(history) - 50), None):  # Last 50 entries
                 item_text = f"{title} - {url}"
                 item = QListWidgetItem(item_text)
                 item.setData(Qt.ItemDataRole.UserRole, (title, url))
@@ -1490,14 +1668,9 @@ class AdvancedSettingsDialog(QDialog):
                 self.bookmarks_list.addItem(item)
     
     def _populate_cookies_list(self):
-        """Populate the cookies list widget"""
+        """Populate the cookies list view"""
         if hasattr(self.parent_browser, 'cookies'):
-            self.cookies_list.clear()
-            for cookie in self.parent_browser.cookies:
-                item_text = f"{cookie.get('name', 'Unknown')} - {cookie.get('domain', 'Unknown domain')}"
-                item = QListWidgetItem(item_text)
-                item.setData(Qt.ItemDataRole.UserRole, cookie)
-                self.cookies_list.addItem(item)
+            self._cookie_model.set_cookies(self.parent_browser.cookies)
     
     def _delete_selected_history(self):
         """Delete selected history items"""
@@ -1514,7 +1687,10 @@ class AdvancedSettingsDialog(QDialog):
                 title, url = item.data(Qt.ItemDataRole.UserRole)
                 # Remove from browser history
                 if hasattr(self.parent_browser, 'history'):
-                    self.parent_browser.history = [(t, u) for t, u in self.parent_browser.history if not (t == title and u == url)]
+                    history = self.parent_browser.history
+                    kept = [(t, u) for t, u in history if not (t == title and u == url)]
+                    history.clear()
+                    history.extend(kept)
                 # Remove from list
                 self.history_list.takeItem(self.history_list.row(item))
             
@@ -1546,8 +1722,9 @@ class AdvancedSettingsDialog(QDialog):
             
             # Save updated bookmarks
             if hasattr(self.parent_browser, 'save_json') and hasattr(self.parent_browser, 'bookmarks_file'):
+                self.parent_browser._sync_bookmark_urls()
                 self.parent_browser.save_json(self.parent_browser.bookmarks_file, self.parent_browser.bookmarks)
-                self.parent_browser.update_bookmarks_menu()
+                self.parent_browser._populate_bookmarks_menu()
             
             QMessageBox.information(self, "Success", f"Deleted {len(selected_items)} bookmark(s).")
     
@@ -1561,38 +1738,40 @@ class AdvancedSettingsDialog(QDialog):
                                    QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
             self.parent_browser.bookmarks = []
+            self.parent_browser._sync_bookmark_urls()
             # Save and refresh UI
             if hasattr(self.parent_browser, 'save_json') and hasattr(self.parent_browser, 'bookmarks_file'):
                 self.parent_browser.save_json(self.parent_browser.bookmarks_file, self.parent_browser.bookmarks)
-            self.parent_browser.update_bookmarks_menu()
+            self.parent_browser._populate_bookmarks_menu()
             self._populate_bookmarks_list()
             QMessageBox.information(self, "Success", "All bookmarks have been cleared.")
     
     def _delete_selected_cookies(self):
         """Delete selected cookies"""
-        selected_items = self.cookies_list.selectedItems()
-        if not selected_items:
+        selected_cookies = [self._cookie_model.cookie_at(index.row()) for index in self.cookies_list.selectionModel().selectedRows()]
+        if not selected_cookies:
             QMessageBox.information(self, "No Selection", "Please select cookies to delete.")
             return
         
         reply = QMessageBox.question(self, "Delete Cookies", 
-                                   f"Are you sure you want to delete {len(selected_items)} cookie(s)?",
+                                   f"Are you sure you want to delete {len(selected_cookies)} cookie(s)?",
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
-            for item in selected_items:
-                cookie_data = item.data(Qt.ItemDataRole.UserRole)
-                # Remove from browser cookies
-                if hasattr(self.parent_browser, 'cookies'):
-                    self.parent_browser.cookies = [c for c in self.parent_browser.cookies if c != cookie_data]
-                # Remove from list
-                self.cookies_list.takeItem(self.cookies_list.row(item))
+            # Remove from browser cookies, then refresh the model once
+            if hasattr(self.parent_browser, 'cookies'):
+                cookies = self.parent_browser.cookies
+                kept = [c for c in cookies if c not in selected_cookies]
+                cookies.clear()
+                cookies.extend(kept)
+                self.parent_browser._sync_cookie_index()
+            self._populate_cookies_list()
             
             # Save updated cookies
             if hasattr(self.parent_browser, 'save_json') and hasattr(self.parent_browser, 'cookies_file'):
                 self.parent_browser.save_json(self.parent_browser.cookies_file, self.parent_browser.cookies)
                 self.parent_browser.update_cookies_menu()
             
-            QMessageBox.information(self, "Success", f"Deleted {len(selected_items)} cookie(s).")
+            QMessageBox.information(self, "Success", f"Deleted {len(selected_cookies)} cookie(s).")
     
     def _clear_all_data(self):
         reply = QMessageBox.question(self, "Clear All Data", 
@@ -1778,7 +1957,7 @@ class AdvancedSettingsDialog(QDialog):
             if shortcut_text:
                 # Basic shortcut validation
                 try:
-                    QKeySequence(shortcut_text)
+                    _keyseq(shortcut_text)
                     shortcuts[action] = shortcut_text
                 except Exception:
                     print(f"Invalid shortcut for {action}: {shortcut_text}")
@@ -2228,10 +2407,16 @@ class CustomWebEngineView(QWebEngineView):
         self.private_mode = private_mode
         # Legacy fallback for Qt versions without newWindowRequested signal
         self._legacy_create_window = False
+        # Encoded form of the current URL for session records; kept current by urlChanged
+        self._last_url_str = ''
+        self.urlChanged.connect(self._remember_url)
         
         # Performance optimizations
         self._setup_performance_optimizations()
     
+    def _remember_url(self, url: QUrl):
+        self._last_url_str = url.toEncoded().data().decode('ascii', errors='ignore')
+
     def _setup_performance_optimizations(self):
         """Set up performance optimizations for this web view"""
         # Enable smooth scrolling and other performance features
@@ -2662,7 +2847,9 @@ class ClaudeAIWorker(QThread):
             self.response_received.emit("Error: No API key configured. Please set your Claude API key in Settings > AI Assistant.")
             return
 
-        client = anthropic.Anthropic(api_key=api_key)
+        # Reuse the widget's client so the HTTP connection pool survives between prompts
+        provider = getattr(self.parent(), 'get_shared_client', None)
+        client = provider(api_key) if provider else anthropic.Anthropic(api_key=api_key)
 
         try:
             response = client.messages.create(
@@ -2679,7 +2866,23 @@ class ClaudeAIWorker(QThread):
 
 # --- Claude AI Widget -------------------------------------------------------------------------
 
+# Patterns for the fallback markdown formatter (compiled once, not per response)
+_RE_MD_HEADING = re.compile(r'(#{1,3})\s+(.+)$')
+_RE_MD_LIST_ITEM = re.compile(r'(?:[*-]|\d+\.)\s+(.+)$')
+_RE_MD_INLINE = re.compile(r'\*\*(?P<b>.+?)\*\*|\*(?P<i>.+?)\*|\[(?P<text>.+?)\]\((?P<href>.+?)\)')
+
+def _md_inline_replace(match):
+    bold = match.group('b')
+    if bold is not None:
+        return f"<b>{_RE_MD_INLINE.sub(_md_inline_replace, bold)}</b>"
+    italic = match.group('i')
+    if italic is not None:
+        return f"<i>{italic}</i>"
+    return f'<a href="{match.group("href")}">{match.group("text")}</a>'
+
 class ClaudeAIWidget(QWidget):
+    MARKDOWN_OFFLOAD_THRESHOLD = 512  # chars; longer responses render off the UI thread
+
     def closeEvent(self, event):
             if hasattr(self, 'worker') and self.worker.isRunning():
                 self.worker.quit()
@@ -2706,6 +2909,13 @@ class ClaudeAIWidget(QWidget):
         
         self.output_window.setReadOnly(True)        
         self.layout.addWidget(self.output_window)
+        # Persistent insertion cursor so responses are written at the end directly
+        self._output_cursor = QTextCursor(self.output_window.document())
+        # Exchanges are numbered as replies arrive and appended strictly in that order,
+        # even when a long reply is still rendering on the pool
+        self._exchange_seq = itertools.count()
+        self._next_exchange = 0
+        self._pending_exchanges: dict[int, tuple[str, str]] = {}
 
         # Controls row (language selector and actions)
         controls_layout = QHBoxLayout()
@@ -2768,6 +2978,10 @@ class ClaudeAIWidget(QWidget):
         self.layout.addWidget(self.loading_spinner)
         self.loading_spinner.hide()  # Hide initially
 
+        # Anthropic client shared across requests; rebuilt only when the API key changes
+        self._anthropic_client = None
+        self._anthropic_client_key = None
+
         # Initialize worker
         self.worker = ClaudeAIWorker("", self.settings_manager, self)
         self.worker.response_received.connect(self.update_output)
@@ -2788,6 +3002,12 @@ class ClaudeAIWidget(QWidget):
         except ImportError:
             self.markdown_module = None
 
+    def get_shared_client(self, api_key: str):
+        if self._anthropic_client is None or self._anthropic_client_key != api_key:
+            self._anthropic_client = anthropic.Anthropic(api_key=api_key)
+            self._anthropic_client_key = api_key
+        return self._anthropic_client
+
     def _voice_available(self):
         return pyaudio is not None and sr is not None
 
@@ -2941,11 +3161,6 @@ class ClaudeAIWidget(QWidget):
         Convert markdown text to HTML using a markdown transpiler.
         Uses the markdown library if available, otherwise falls back to basic formatter.
         """
-        # Heuristic: offload large markdown blocks to background worker pool
-        if getattr(self, 'background_pool', None) and text and len(text) > 4000:
-            self._offload_markdown(text)
-            return "<i>Rendering large markdown in background...</i>"
-
         if self.markdown_module:
             try:
                 html = self.markdown_module.markdown(text, extensions=['fenced_code'])
@@ -2957,79 +3172,162 @@ class ClaudeAIWidget(QWidget):
         return self.format_markdown_code_blocks(text)
 
     def format_markdown_code_blocks(self, text):
-        # Detect code fences and wrap them in HTML for better readability
-        pattern = r'```(.*?)\n(.*?)´´´'
-        def replacer(match):
-            lang = match.group(1).strip()
-            code_text = match.group(2).replace('<', '&lt;').replace('>', '&gt;')
-            if lang and lang.lower() == 'python':
+        # Single line-oriented pass: each line is classified once (code fence, heading,
+        # list item or plain text) and written out, instead of one re.sub per construct
+        out = io.StringIO()
+        write = out.write
+        inline = _RE_MD_INLINE.sub
+        started = False
+        gap = False
+
+        def emit(html):
+            nonlocal started, gap
+            if started:
+                write('<br><br>' if gap else '\n')
+            write(html)
+            started = True
+            gap = False
+
+        def code_block(lang, lines):
+            code_text = _html_escape('\n'.join(lines), quote=False)
+            if lang.lower() == 'python':
                 # Python code
                 return f"<pre><code style='color: #0000AA;'>{code_text}</code></pre>"
-            else:
-                # No specified language
-                return f"<pre><code>{code_text}</code></pre>"
-        
-        # Process code blocks
-        processed_text = re.sub(pattern, replacer, text, flags=re.DOTALL)
-        
-        # Process headers (# Header)
-        processed_text = re.sub(r'^#\s+(.+)$', r'<h1>\1</h1>', processed_text, flags=re.MULTILINE)
-        processed_text = re.sub(r'^##\s+(.+)$', r'<h2>\1</h2>', processed_text, flags=re.MULTILINE)
-        processed_text = re.sub(r'^###\s+(.+)$', r'<h3>\1</h3>', processed_text, flags=re.MULTILINE)
-        
-        # Process bullet lists
-        processed_text = re.sub(r'^\*\s+(.+)$', r'<li>\1</li>', processed_text, flags=re.MULTILINE)
-        processed_text = re.sub(r'^-\s+(.+)$', r'<li>\1</li>', processed_text, flags=re.MULTILINE)
-        
-        # Process numbered lists
-        processed_text = re.sub(r'^\d+\.\s+(.+)$', r'<li>\1</li>', processed_text, flags=re.MULTILINE)
-        
-        # Process bold (**text**)
-        processed_text = re.sub(r'\*\*(.+?)\*\*', r'<b>\1</b>', processed_text)
-        
-        # Process italic (*text*)
-        processed_text = re.sub(r'\*(.+?)\*', r'<i>\1</i>', processed_text)
-        
-        # Process links [text](url)
-        processed_text = re.sub(r'\[(.+?)\]\((.+?)\)', r'<a href="\2">\1</a>', processed_text)
-        
-        # Add paragraph breaks
-        processed_text = re.sub(r'\n\n+', r'<br><br>', processed_text)
-        
-        return processed_text
+            # No specified language
+            return f"<pre><code>{code_text}</code></pre>"
+
+        fence_lang = None
+        code_lines = []
+        for line in text.split('\n'):
+            stripped = line.strip()
+            if fence_lang is not None:
+                if stripped.startswith('```'):
+                    emit(code_block(fence_lang, code_lines))
+                    fence_lang = None
+                    code_lines = []
+                else:
+                    code_lines.append(line)
+                continue
+            if stripped.startswith('```'):
+                fence_lang = stripped[3:].strip()
+                continue
+            if not stripped:
+                # Runs of blank lines become a paragraph break
+                gap = started
+                continue
+            heading = _RE_MD_HEADING.match(line)
+            if heading:
+                level = len(heading.group(1))
+                emit(f"<h{level}>{inline(_md_inline_replace, heading.group(2))}</h{level}>")
+                continue
+            item = _RE_MD_LIST_ITEM.match(line)
+            if item:
+                emit(f"<li>{inline(_md_inline_replace, item.group(1))}</li>")
+                continue
+            emit(inline(_md_inline_replace, line))
+        if fence_lang is not None:
+            # Unterminated fence: still render what was collected as code
+            emit(code_block(fence_lang, code_lines))
+        return out.getvalue()
 
     def update_output(self, response):
         user_input = self.worker.user_input
-        formatted_response = self.format_markdown(response)
-        self.output_window.append(
+        seq = next(self._exchange_seq)
+        # Anything beyond a short reply is rendered on the background pool so the
+        # markdown conversion never stalls the Qt event loop
+        if response and len(response) > self.MARKDOWN_OFFLOAD_THRESHOLD and self._offload_markdown(response, user_input, seq):
+            return
+        self._queue_exchange(seq, user_input, self.format_markdown(response))
+
+    def _queue_exchange(self, seq, user_input, formatted_response):
+        """Hold a rendered exchange until every earlier one has been appended."""
+        self._pending_exchanges[seq] = (user_input, formatted_response)
+        while self._next_exchange in self._pending_exchanges:
+            self._append_exchange(*self._pending_exchanges.pop(self._next_exchange))
+            self._next_exchange += 1
+
+    def _append_exchange(self, user_input, formatted_response):
+        cursor = self._output_cursor
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertHtml(
+            ("" if self.output_window.document().isEmpty() else "<br>") +
             f"<span style='color: red; font-weight: bold;'>Human:</span> {user_input}<br><br>"
             f"<span style='color: blue; font-weight: bold;'>Assistant:</span> {formatted_response}<br>"
         )
-    def _offload_markdown(self, md_text: str):
+        scrollbar = self.output_window.verticalScrollBar()
+        scrollbar.setValue(scrollbar.maximum())
+
+    def _offload_markdown(self, md_text: str, user_input: str, seq: int) -> bool:
         pool = getattr(self, 'background_pool', None)
         if not pool:
-            return
-        enable_md = bool(getattr(self, 'markdown_module', None))
+            return False
         def _apply(html):
+            if isinstance(html, Exception):
+                html = f"<pre>Background render failed: {html}</pre>"
             try:
-                self.output_window.append(html)
+                self._queue_exchange(seq, user_input, html)
             except Exception:
                 pass
         try:
-            pool.submit(_markdown_convert_task, md_text, enable_md, callback=_apply)
+            # Same formatter as the inline path (markdown module or the basic fallback);
+            # it touches no Qt objects, so it is safe on a pool thread
+            return pool.submit(self.format_markdown, md_text, callback=_apply) is not None
         except Exception as e:
-            self.output_window.append(f"<pre>Background render failed: {e}</pre>")
+            print(f"Background markdown render failed: {e}")
+            return False
 
 # --- AdBlocker Worker -------------------------------------------------------------------------
 
+# Rule options understood by every AdblockRules engine we build (full, generic and per-host)
+_ADBLOCK_OPTIONS = (
+    'domain', 'third-party', 'image', 'script', 'stylesheet', 'xmlhttprequest', 'subdocument',
+    'document', 'media', 'font', 'object', 'ping', 'other',
+)
+
+@functools.lru_cache(maxsize=4096)
+def _norm_host(host: str) -> str:
+    """Lower-case host without a leading 'www.' or surrounding dots/whitespace."""
+    host = host.lower().strip()
+    if host.startswith('www.'):
+        host = host[4:]
+    return host.strip('.')
+
+@functools.lru_cache(maxsize=4096)
+def _host_tokens(host_norm: str) -> frozenset[str]:
+    """Dotted suffixes of a normalized host (example.com, sub.example.com, ...)."""
+    parts = [p for p in host_norm.split('.') if p]
+    return frozenset('.'.join(parts[i:]) for i in range(len(parts) - 1))
+
+def _merge_rule_indexes(domain_index, tokens, limit: int = 1200) -> list[int]:
+    """Union of the sorted domain_index buckets for tokens, ascending and capped at limit."""
+    buckets = [bucket for bucket in map(domain_index.get, tokens) if bucket]
+    merged: list[int] = []
+    prev = -1
+    for idx in heapq.merge(*buckets):
+        if idx != prev:
+            merged.append(idx)
+            if len(merged) >= limit:
+                break
+            prev = idx
+    return merged
+
+def _domain_membership_set(domains):
+    """Immutable membership structure for blocked domains: a compact marisa trie when
+    the optional package is installed, otherwise a frozenset."""
+    if marisa_trie is not None:
+        try:
+            return marisa_trie.Trie(list(domains))
+        except Exception:
+            pass
+    return frozenset(domains)
+
 class AdBlockerWorker:
     def __init__(self, rules=None, pool: 'IOPool' | None = None, cache_path: str | None = None, cache_max_age: int = 86400):
         self.rules = rules  # Monolithic engine (legacy)
         # Incremental mode attributes
         self._all_rule_lines: list[str] | None = None
         self._domain_index: dict[str, list[int]] = {}
-        self._compiled_cache: dict[tuple[str, ...], AdblockRules] = {}
-        self._compiled_cache_order: list[tuple[str, ...]] = []
+        self._compiled_cache: OrderedDict[tuple[str, ...], AdblockRules] = OrderedDict()  # insertion order doubles as LRU order
         self._compiled_cache_limit = 128  # cached subset variants
         self._lock = threading.RLock()
         self.incremental_enabled = False  # Use monolithic engine for simplicity
@@ -3038,11 +3336,29 @@ class AdBlockerWorker:
         self.cache_path = cache_path
         self.cache_max_age = cache_max_age
         self.generic_engine: AdblockRules | None = None  # quick generic engine for early blocking
-        self.blocked_domains: set[str] = set()  # Fast prefilter set of domains to block
-        self.domain_block_set: set[str] = set()
+        self.blocked_domains = frozenset()  # Fast prefilter set of domains to block
+        self.domain_block_set = self.blocked_domains  # same object, shared with the interceptors
         self._generic_subset_lines: list[str] = []
+        self._generic_subset_head: list[str] = []  # leading generic rules appended to every per-host subset
         self._full_rules_future = None
         self._full_rules_timer: threading.Timer | None = None
+        self._session: aiohttp.ClientSession | None = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Lazily create the pooled HTTP session used for list downloads (and later refreshes)."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=16, limit_per_host=4, ttl_dns_cache=300, keepalive_timeout=75)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'Accept-Encoding': 'gzip'},
+                timeout=aiohttp.ClientTimeout(total=30, sock_connect=10),
+            )
+        return self._session
+
+    async def close(self):
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
 
     async def download_adblock_lists(self):
         """Download EasyList + EasyPrivacy and prepare incremental-friendly structures."""
@@ -3052,32 +3368,27 @@ class AdBlockerWorker:
         self.generic_engine = None
         self._all_rule_lines = []
         self._domain_index.clear()
-        self.blocked_domains.clear()
-        self.domain_block_set.clear()
+        self.blocked_domains = self.domain_block_set = frozenset()
         # 1. Try cache
         if self.cache_path and os.path.exists(self.cache_path):
             try:
                 mtime = os.path.getmtime(self.cache_path)
                 if (time.time() - mtime) < self.cache_max_age:
-                    with open(self.cache_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        lines = f.read().splitlines()
+                    lines = self._read_list_cache()
                     print(f"Adblock: loaded cached lists ({len(lines)} lines)")
             except Exception as e:
                 print(f"Adblock cache read failed: {e}")
         # 2. If no fresh cache, download in background (still inside this async)
         if not lines:
             urls = [
-                "https://easylist.to/easylist/easylist.txt"
+                "https://easylist.to/easylist/easylist.txt",
+                "https://easylist.to/easylist/easyprivacy.txt",
             ]
             texts = []
             try:
-                async with aiohttp.ClientSession() as session:
-                    for url in urls:
-                        try:
-                            async with session.get(url, timeout=30) as resp:
-                                texts.append(await resp.text())
-                        except Exception as e:
-                            print(f"Adblock download warning: {url} failed: {e}")
+                # Fetch all lists concurrently over the shared pooled session; gzip transfer is decoded by aiohttp
+                session = self._get_session()
+                texts = await asyncio.gather(*(self._fetch_list(session, url) for url in urls))
             except Exception as e:
                 print(f"Adblock download failed: {e}")
                 texts = []
@@ -3086,8 +3397,7 @@ class AdBlockerWorker:
             # Persist cache (best effort)
             if lines and self.cache_path:
                 try:
-                    with open(self.cache_path, 'w', encoding='utf-8') as f:
-                        f.write('\n'.join(lines))
+                    self._write_list_cache(lines)
                 except Exception as e:
                     print(f"Adblock cache write failed: {e}")
         if not lines:
@@ -3122,6 +3432,70 @@ class AdBlockerWorker:
         if not self.incremental_enabled:
             self._ensure_full_rules_async(delay=0.0)
 
+    # List cache layout: magic, struct '<II' (crc32 of body, line count), then the
+    # newline-joined UTF-8 body. Older plain-text caches are still readable.
+    _LIST_CACHE_MAGIC = b'SSABL1\0'
+    _LIST_CACHE_HEADER = struct.Struct('<II')
+
+    def _read_list_cache(self) -> list[str]:
+        magic = self._LIST_CACHE_MAGIC
+        header = self._LIST_CACHE_HEADER
+        with open(self.cache_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    if view[:len(magic)] != magic:
+                        return str(view, 'utf-8', 'ignore').splitlines()
+                    crc, count = header.unpack_from(view, len(magic))
+                    body = view[len(magic) + header.size:]
+                    try:
+                        if zlib.crc32(body) != crc:
+                            print("Adblock cache checksum mismatch; ignoring cache")
+                            return []
+                        lines = str(body, 'utf-8', 'ignore').split('\n') if count else []
+                    finally:
+                        body.release()
+        return lines if len(lines) == count else []
+
+    def _cached_list_crc(self):
+        magic = self._LIST_CACHE_MAGIC
+        header = self._LIST_CACHE_HEADER
+        try:
+            with open(self.cache_path, 'rb') as f:
+                head = f.read(len(magic) + header.size)
+        except OSError:
+            return None
+        if len(head) != len(magic) + header.size or not head.startswith(magic):
+            return None
+        return header.unpack_from(head, len(magic))[0]
+
+    def _write_list_cache(self, lines: list[str]):
+        body = '\n'.join(lines).encode('utf-8')
+        crc = zlib.crc32(body)
+        if self._cached_list_crc() == crc:
+            # Same lists as last time: refresh the age stamp instead of rewriting megabytes
+            os.utime(self.cache_path, None)
+            return
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self._LIST_CACHE_MAGIC)
+            f.write(self._LIST_CACHE_HEADER.pack(crc, len(lines)))
+            f.write(body)
+        os.replace(tmp_path, self.cache_path)
+
+    async def _fetch_list(self, session, url: str) -> str:
+        """Download one filter list, streaming the body in chunks."""
+        try:
+            async with session.get(url) as resp:
+                buf = bytearray()
+                async for chunk in resp.content.iter_chunked(65536):
+                    buf.extend(chunk)
+                return buf.decode('utf-8', errors='ignore')
+        except Exception as e:
+            print(f"Adblock download warning: {url} failed: {e}")
+            return ""
+
     def _prepare_incremental_structures(self, lines: list[str]):
         """Build domain index and generic subsets for incremental ad blocking."""
         domain_index: dict[str, list[int]] = {}
@@ -3143,7 +3517,7 @@ class AdBlockerWorker:
                 token = token[1:]
             if not token or '.' not in token:
                 return ""
-            if re.search(r"[^a-z0-9.-]", token):
+            if _INVALID_DOMAIN_CHARS.search(token):
                 return ""
             return token
 
@@ -3156,21 +3530,30 @@ class AdBlockerWorker:
                 keys.add('.'.join(parts[-2:]))
             for key in keys:
                 bucket = domain_index.setdefault(key, [])
-                if len(bucket) < 160:
+                # Lines are visited in order, so buckets stay sorted and duplicate-free
+                if len(bucket) < 160 and (not bucket or bucket[-1] != idx):
                     bucket.append(idx)
             if not is_exception:
                 blocked.add(token)
                 if len(parts) >= 2:
                     blocked.add('.'.join(parts[-2:]))
 
+        # Scan the whole list once for ||domain anchors and map each hit back to its
+        # line through the cumulative line-start offsets, instead of one finditer per line
+        blob = '\n'.join(lines)
+        line_starts = list(itertools.accumulate((len(l) + 1 for l in lines), initial=0))
+        anchored: dict[int, set[str]] = {}
+        locate = bisect.bisect_right
+        for match in _DOMAIN_TOKEN_PATTERN.finditer(blob):
+            anchored.setdefault(locate(line_starts, match.start()) - 1, set()).add(match.group(1))
+        del blob
+
         for idx, raw in enumerate(lines):
             line = raw.strip()
             if not line or line.startswith('!'):
                 continue
             is_exception = line.startswith('@@')
-            tokens = set()
-            for match in _DOMAIN_TOKEN_PATTERN.finditer(line):
-                tokens.add(match.group(1))
+            tokens = anchored.get(idx) or set()
             if '||' not in line or not tokens:
                 for match in _PLAIN_DOMAIN_PATTERN.finditer(line):
                     tokens.add(match.group(1))
@@ -3199,17 +3582,17 @@ class AdBlockerWorker:
             domain_index_local = {str(k): list(v) for k, v in (domain_index or {}).items()}
         else:
             domain_index_local = domain_index or {}
-        blocked_set = set(blocked or [])
+        blocked_set = _domain_membership_set(blocked or ())
         generic_list = list(generic_subset or [])
 
         self._all_rule_lines = list(lines)
         self._domain_index = domain_index_local
         self.blocked_domains = blocked_set
-        self.domain_block_set = set(blocked_set)
+        self.domain_block_set = blocked_set
         self._compiled_cache.clear()
-        self._compiled_cache_order.clear()
         self._building.clear()
         self._generic_subset_lines = generic_list
+        self._generic_subset_head = generic_list[:200]
         with self._lock:
             self.rules = None
         if self._full_rules_timer and self._full_rules_timer.is_alive():
@@ -3222,9 +3605,7 @@ class AdBlockerWorker:
 
         if generic_list:
             try:
-                self.generic_engine = AdblockRules(generic_list, supported_options=[
-                    'domain','third-party','image','script','stylesheet','xmlhttprequest','subdocument','document','media','font','object','ping','other'
-                ])
+                self.generic_engine = AdblockRules(generic_list, supported_options=_ADBLOCK_OPTIONS)
             except Exception:
                 self.generic_engine = None
         else:
@@ -3272,13 +3653,53 @@ class AdBlockerWorker:
         lines = self._all_rule_lines or []
         if not lines:
             return None
+        # Reuse the engine compiled on a previous run when the rule text is unchanged
+        engine_path = f"{self.cache_path}.engine" if self.cache_path else None
+        digest = None
+        if engine_path:
+            digest = hashlib.blake2b('\n'.join(lines).encode('utf-8', errors='ignore'), digest_size=16).hexdigest()
+            rules = self._load_full_rules_snapshot(engine_path, digest)
+            if rules is not None:
+                return rules
         try:
-            return AdblockRules(lines, supported_options=[
-                'domain','third-party','image','script','stylesheet','xmlhttprequest','subdocument','document','media','font','object','ping','other'
-            ])
+            rules = AdblockRules(lines, supported_options=_ADBLOCK_OPTIONS)
         except Exception as e:
             print(f"Adblock full-rule build failed: {e}")
             return None
+        if engine_path:
+            self._store_full_rules_snapshot(engine_path, digest, rules)
+        return rules
+
+    def _load_full_rules_snapshot(self, engine_path: str, digest: str):
+        if not os.path.exists(engine_path):
+            return None
+        try:
+            with open(engine_path, 'rb') as handle:
+                # The digest is its own leading record, so a stale engine is rejected
+                # without unpickling it
+                if pickle.load(handle) != digest:
+                    return None
+                rules = pickle.load(handle)
+            print("Adblock: restored compiled rules from cache")
+            return rules
+        except Exception as e:
+            print(f"Adblock engine cache load failed: {e}")
+            return None
+
+    def _store_full_rules_snapshot(self, engine_path: str, digest: str, rules):
+        # Single file keyed by digest: a new rule set simply overwrites the stale engine
+        tmp_path = f"{engine_path}.tmp"
+        try:
+            with open(tmp_path, 'wb') as handle:
+                pickle.dump(digest, handle, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(rules, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, engine_path)
+        except Exception as e:
+            print(f"Adblock engine cache save failed: {e}")
+            try:
+                os.remove(tmp_path)
+            except Exception:
+                pass
 
     def _set_full_rules(self, rules):
         if rules:
@@ -3340,33 +3761,17 @@ class AdBlockerWorker:
         self._full_rules_timer = timer
         timer.start()
 
-    def _tokenize_host(self, host: str | None) -> set[str]:
+    def _tokenize_host(self, host: str | None) -> frozenset[str]:
         if not host:
-            return set()
-        host_norm = host.lower().strip()
-        if not host_norm:
-            return set()
-        if host_norm.startswith('www.'):
-            host_norm = host_norm[4:]
-        host_norm = host_norm.strip('.')
-        if not host_norm:
-            return set()
-        parts = [p for p in host_norm.split('.') if p]
-        tokens: set[str] = set()
-        for i in range(len(parts)):
-            suffix = '.'.join(parts[i:])
-            if suffix.count('.') >= 1:
-                tokens.add(suffix)
-        return tokens
+            return frozenset()
+        return _host_tokens(_norm_host(host))
 
     def _domain_might_match(self, host: str | None) -> bool:
         if not host:
             return False
-        tokens = self._tokenize_host(host)
-        for token in tokens:
-            if token in self.blocked_domains:
-                return True
-        return False
+        # Exact membership over the host's suffixes; map runs the probe loop in C and
+        # works for both the frozenset and the trie form of blocked_domains
+        return any(map(self.blocked_domains.__contains__, self._tokenize_host(host)))
 
     def likely_blocks_host(self, host: str) -> bool:
         return self._domain_might_match(host)
@@ -3384,92 +3789,73 @@ class AdBlockerWorker:
         except Exception:
             request_host = ""
 
-        blocked = False
-        subset_engine = None
-        fallback_needed = False
-
         if self.incremental_enabled:
-            subset_engine = self.get_rules_for(first_party, request_host)
-            if subset_engine:
-                try:
-                    blocked = bool(subset_engine.should_block(url, opts))
-                except Exception as e:
-                    print(f"Adblock subset error: {e}")
-                    blocked = False
-                fallback_needed = (subset_engine is None) or (subset_engine is self.generic_engine)
-            else:
-                fallback_needed = True
-        else:
-            fallback_needed = True
-
-        if fallback_needed and not blocked:
-            self._ensure_full_rules_async()
-            if self.rules and self.rules is not subset_engine:
-                try:
-                    blocked = bool(self.rules.should_block(url, opts))
-                except Exception as e:
-                    print(f"Adblock should_block error: {e}")
-                    blocked = False
+            # Per-host subsets (plus the generic engine for hosts without domain rules) are
+            # authoritative here; the monolithic engine is never built in this mode
+            engine = self.get_rules_for(first_party, request_host)
+            if not engine:
+                return False
+            try:
+                return bool(engine.should_block(url, opts))
+            except Exception as e:
+                print(f"Adblock subset error: {e}")
+                return False
 
-        return blocked
+        # Monolithic mode: allow until the background build lands
+        self._ensure_full_rules_async()
+        rules = self.rules
+        if not rules:
+            return False
+        try:
+            return bool(rules.should_block(url, opts))
+        except Exception as e:
+            print(f"Adblock should_block error: {e}")
+            return False
 
     def _lru_touch(self, key):
+        """Mark a cached engine as most recently used (caller holds the lock)."""
         try:
-            if key in self._compiled_cache_order:
-                self._compiled_cache_order.remove(key)
-            self._compiled_cache_order.append(key)
-            while len(self._compiled_cache_order) > self._compiled_cache_limit:
-                old = self._compiled_cache_order.pop(0)
-                old_engine = self._compiled_cache.pop(old, None)
-                # Let GC reclaim
-        except Exception:
+            self._compiled_cache.move_to_end(key)
+        except KeyError:
             pass
 
+    def _cache_store(self, key, engine):
+        """Insert an engine as most recently used and evict from the cold end (caller holds the lock)."""
+        cache = self._compiled_cache
+        cache[key] = engine
+        cache.move_to_end(key)
+        while len(cache) > self._compiled_cache_limit:
+            cache.popitem(last=False)  # Let GC reclaim the oldest engine
+
     def _select_subset_lines(self, tokens: set[str]):
         """Return rule lines relevant to the provided token set."""
         if not tokens:
             return []
         lines = self._all_rule_lines or []
         domain_index = self._domain_index
-        line_indexes: set[int] = set()
-        for token in tokens:
-            bucket = domain_index.get(token)
-            if not bucket:
-                continue
-            for idx in bucket:
-                line_indexes.add(idx)
-                if len(line_indexes) >= 1200:
-                    break
-            if len(line_indexes) >= 1200:
-                break
+        line_indexes = _merge_rule_indexes(domain_index, tokens)
         if not line_indexes:
             return []
-        subset = [lines[i] for i in sorted(line_indexes)]
-        if self._generic_subset_lines:
-            subset.extend(self._generic_subset_lines[:200])
+        subset = [lines[i] for i in line_indexes]
+        subset.extend(self._generic_subset_head)
         return subset
 
     @staticmethod
     def _subset_builder_task(token_key: tuple[str, ...], lines: list[str], domain_index: dict[str, list[int]], generic_subset: list[str] | None):
         tokens = set(token_key)
-        line_indexes: set[int] = set()
-        for token in tokens:
-            bucket = domain_index.get(token)
-            if not bucket:
-                continue
-            for idx in bucket:
-                line_indexes.add(idx)
-                if len(line_indexes) >= 1200:
-                    break
-            if len(line_indexes) >= 1200:
-                break
+        line_indexes = _merge_rule_indexes(domain_index, tokens)
         if not line_indexes:
-            subset = []
-        else:
-            subset = [lines[i] for i in sorted(line_indexes)]
+            return token_key, None
+        subset = [lines[i] for i in line_indexes]
         if generic_subset:
-            subset.extend(generic_subset[:200])
-        return token_key, subset
+            subset.extend(generic_subset)
+        # Compile here, on the pool thread, so the UI side only has to store the engine
+        try:
+            engine = AdblockRules(subset, supported_options=_ADBLOCK_OPTIONS)
+        except Exception as e:
+            print(f"Adblock async subset build failed for {token_key}: {e}")
+            engine = None
+        return token_key, engine
 
     def prefetch_domain(self, host: str):
         """Asynchronously build and cache rules for a domain using the background pool.
@@ -3488,36 +3874,29 @@ class AdBlockerWorker:
             lines = self._all_rule_lines or []
             domain_index = self._domain_index
         # Submit task (arguments must be picklable)
-        generic_subset = self._generic_subset_lines
+        generic_subset = self._generic_subset_head
         future = self.pool.submit(self._subset_builder_task, key, lines, domain_index, generic_subset)
-        future.add_done_callback(lambda f: self._on_subset_ready(f.result()))
+        if future is None:
+            with self._lock:
+                self._building.discard(key)
+            return
+        future.add_done_callback(lambda f, k=key: self._on_subset_ready(f.result() if f.exception() is None else (k, None)))
 
     def _on_subset_ready(self, result):
         try:
-            bundle = result if isinstance(result, tuple) else (None, [])
+            bundle = result if isinstance(result, tuple) else (None, None)
             if len(bundle) != 2:
                 key = None
-                selected = []
+                engine = None
             else:
-                key, selected = bundle
-            if not key or not selected:
-                with self._lock:
-                    if key in self._building:
-                        self._building.remove(key)
-                return
-            try:
-                engine = AdblockRules(selected, supported_options=[
-                    'domain','third-party','image','script','stylesheet','xmlhttprequest','subdocument','document','media','font','object','ping','other'
-                ])
-            except Exception as e:
-                print(f"Adblock async subset build failed for {key}: {e}")
+                key, engine = bundle
+            if not key or engine is None:
                 with self._lock:
                     if key in self._building:
                         self._building.remove(key)
                 return
             with self._lock:
-                self._compiled_cache[key] = engine
-                self._lru_touch(key)
+                self._cache_store(key, engine)
                 if key in self._building:
                     self._building.remove(key)
         except Exception as e:
@@ -3530,8 +3909,7 @@ class AdBlockerWorker:
                 self._ensure_full_rules_async()
             return self.rules or self.generic_engine
 
-        token_set = self._tokenize_host(first_party_domain)
-        token_set.update(self._tokenize_host(request_host))
+        token_set = self._tokenize_host(first_party_domain) | self._tokenize_host(request_host)
         if not token_set:
             return self.rules or self.generic_engine
 
@@ -3541,6 +3919,9 @@ class AdBlockerWorker:
             if engine:
                 self._lru_touch(key)
                 return engine
+            if key in self._building:
+                # A prefetch is already compiling this subset; don't duplicate it on this thread
+                return self.generic_engine
 
         selected = self._select_subset_lines(token_set)
         if not selected and self.generic_engine:
@@ -3548,26 +3929,189 @@ class AdBlockerWorker:
         if not selected:
             return self.rules
         try:
-            engine = AdblockRules(selected, supported_options=[
-                'domain','third-party','image','script','stylesheet','xmlhttprequest','subdocument','document','media','font','object','ping','other'
-            ])
+            engine = AdblockRules(selected, supported_options=_ADBLOCK_OPTIONS)
         except Exception as e:
             print(f"Adblock subset compile failed for {key}: {e}")
             return self.generic_engine or self.rules
 
         with self._lock:
-            self._compiled_cache[key] = engine
-            self._lru_touch(key)
+            self._cache_store(key, engine)
         return engine
 
 # --- Main Browser Window ----------------------------------------------------------------------
 
+class _FaviconNameTable(dict):
+    """str.translate table: keeps [a-z0-9_.-] and maps every other code point to '_'."""
+    def __missing__(self, codepoint):
+        self[codepoint] = 95  # '_'
+        return 95
+
+_FAVICON_NAME_TABLE = _FaviconNameTable((ord(c), ord(c)) for c in 'abcdefghijklmnopqrstuvwxyz0123456789_.-')
+
+@functools.lru_cache(maxsize=1024)
+def _favicon_safe_name(key: str) -> str:
+    return key.translate(_FAVICON_NAME_TABLE)
+
+# Settings shortcut names applied by _apply_custom_shortcuts -> Browser method. Actions that
+# create_shortcuts already binds (new_tab, reload, find, ...) are intentionally absent.
+_CUSTOM_SHORTCUT_ACTIONS = (
+    ('hard_reload', 'refresh_current_tab'),
+    ('zoom_out', 'zoom_out'),
+    ('downloads', 'show_download_manager'),
+    ('settings', 'show_settings_dialog'),
+)
+
+def _configure_menu_list_view(view: QListView):
+    """Single-line rows with one height: skip per-row sizeHint and lay out off-screen rows in batches."""
+    view.setUniformItemSizes(True)
+    view.setLayoutMode(QListView.LayoutMode.Batched)
+    view.setBatchSize(50)
+
+@functools.lru_cache(maxsize=2048)
+def _completion_dedup_key(url: str) -> str:
+    """URL identity for completer de-duplication: no scheme, fragment or trailing slash; host lower-cased."""
+    try:
+        parts = urlparse(url)
+    except ValueError:
+        return url
+    if not parts.netloc:
+        return url.rstrip('/')
+    key = parts.netloc.lower() + parts.path.rstrip('/')
+    if parts.params:
+        key += ';' + parts.params
+    return key + '?' + parts.query if parts.query else key
+
+def _set_web_attributes(settings, attrs, applied=None):
+    """setAttribute for each (attribute, value) in attrs that differs from the previously applied tuple."""
+    if applied == attrs:
+        return
+    if applied is None or len(applied) != len(attrs):
+        for attr, value in attrs:
+            settings.setAttribute(attr, value)
+        return
+    for (attr, value), (_, old) in zip(attrs, applied):
+        if value != old:
+            settings.setAttribute(attr, value)
+
+@functools.lru_cache(maxsize=1024)
+def _cookie_expiry(expiry: str) -> QDateTime:
+    """Parsed ISO expiry of a stored cookie; setExpirationDate copies it, so the cached value is never mutated."""
+    return QDateTime.fromString(expiry, Qt.DateFormat.ISODate)
+
+def _list_item_url(item) -> str:
+    """URL of a 'title - url' list item: its UserRole data, or parsed from the text for older items."""
+    url = item.data(Qt.ItemDataRole.UserRole)
+    if url:
+        return url
+    return item.text().rsplit(" - ", 1)[-1]
+
+@functools.lru_cache(maxsize=128)
+def _keyseq(text: str) -> QKeySequence:
+    """Parsed QKeySequence for a shortcut string; QShortcut/QAction take their own copy."""
+    return QKeySequence(text)
+
+def _read_json_file(file_path):
+    """Parse a JSON data file (orjson when available); missing files yield an empty list."""
+    if not os.path.exists(file_path):
+        return []
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+# Field extractor for persisted cookie dicts (C-level multi-key lookup)
+_COOKIE_FIELDS = itemgetter('name', 'value', 'domain', 'path', 'expiry')
+# Identity of a persisted cookie: a new value for the same key replaces the old one
+_COOKIE_KEY = itemgetter('name', 'domain', 'path')
+
+# Paint/navigation timing probe. With perf tracing enabled it is installed once per profile as a
+# QWebEngineScript defining __surfscapePerf in the application world; each load then only sends
+# the short _PAGE_PERF_CALL instead of the whole source.
+_PAGE_PERF_JS = """
+    window.__surfscapePerf = function(){
+        if(!window.performance){return null;}
+        const byType = performance.getEntriesByType ? performance.getEntriesByType.bind(performance) : null;
+        let nav = byType ? (byType('navigation')[0] || null) : null;
+        let paint = byType ? byType('paint') : [];
+        let fp = null; let fcp = null;
+        for (const p of paint){ if(p.name==='first-paint') fp = p.startTime; if(p.name==='first-contentful-paint') fcp = p.startTime; }
+        const t = performance.timing || {};
+        function clamp(v){return (typeof v==='number' && v>=0 && v<1e8)? v : null;}
+        let metrics = {};
+        if(nav){
+            metrics = {
+                dns: clamp(nav.domainLookupEnd - nav.domainLookupStart),
+                connect: clamp(nav.connectEnd - nav.connectStart),
+                ttfb: clamp(nav.responseStart - nav.startTime),
+                response: clamp(nav.responseEnd - nav.responseStart),
+                domContentLoaded: clamp(nav.domContentLoadedEventEnd - nav.startTime),
+                firstPaint: clamp(fp),
+                firstContentfulPaint: clamp(fcp),
+                load: clamp(nav.loadEventEnd - nav.startTime)
+            };
+        } else if(t.navigationStart){
+            const ns = t.navigationStart;
+            metrics = {
+                dns: clamp(t.domainLookupEnd - t.domainLookupStart),
+                connect: clamp(t.connectEnd - t.connectStart),
+                ttfb: clamp(t.responseStart - ns),
+                response: clamp(t.responseEnd - t.responseStart),
+                domContentLoaded: clamp(t.domContentLoadedEventEnd - ns),
+                firstPaint: clamp(fp),
+                firstContentfulPaint: clamp(fcp),
+                load: clamp(t.loadEventEnd - ns)
+            };
+        }
+        // Top 5 slow resources (exclude data: and chrome-extension:), kept sorted in a
+        // single pass over the entries instead of collect + sort + slice
+        if (byType){
+            const resources = byType('resource') || [];
+            const kinds = {img: 1, script: 1, css: 1, fetch: 1, xmlhttprequest: 1};
+            let slow = [];
+            for (let i = 0; i < resources.length; i++){
+                const r = resources[i];
+                if (r.duration <= 500 || !kinds[r.initiatorType]) continue;
+                if (slow.length === 5 && r.duration <= slow[4].dur) continue;
+                if (r.name.startsWith('data:') || r.name.startsWith('chrome-extension')) continue;
+                const entry = {name: r.name.slice(0,140), type: r.initiatorType, dur: Math.round(r.duration)};
+                let j = slow.length < 5 ? slow.length : 4;
+                while (j > 0 && slow[j-1].dur < entry.dur){ slow[j] = slow[j-1]; j--; }
+                slow[j] = entry;
+            }
+            metrics.slow = slow;
+        }
+        return metrics;
+    };
+"""
+_PAGE_PERF_CALL = "window.__surfscapePerf ? window.__surfscapePerf() : null"
+# Session log size past which it is rewritten as one upsert per open tab
+_SESSION_LOG_COMPACT_BYTES = 256 * 1024
+
+_PAGE_PERF_FIELDS = ('dns', 'connect', 'ttfb', 'response', 'domContentLoaded', 'firstPaint', 'firstContentfulPaint', 'load')
+
+def _print_perf_metrics(metrics: dict) -> None:
+    """Format and write one PagePerf line; runs on the IO pool so terminal writes never stall the UI."""
+    try:
+        dns, connect, ttfb, response, dcl, fp, fcp, load = map(metrics.get, _PAGE_PERF_FIELDS)
+        slow = metrics.get('slow') or []
+        slow_str = ''
+        if slow:
+            slow_str = ' slow=[' + ', '.join([f"{s['type']}:{s['dur']}ms" for s in slow]) + ']'
+        sys.stdout.write(
+            f"PagePerf dns={dns}ms connect={connect}ms ttfb={ttfb}ms resp={response}ms dcl={dcl}ms "
+            f"fp={fp}ms fcp={fcp}ms load={load}ms{slow_str}\n"
+        )
+        sys.stdout.flush()
+    except Exception:
+        pass
+
 class Browser(QMainWindow):
     def __init__(self, io_pool: IOPool | None = None, fast_start: bool | None = None):
         super().__init__()
         self.setWindowTitle("surfscape")
         self.setMinimumSize(800, 640)
-        self.background_pool = io_pool if io_pool is not None else IOPool()
+        self.background_pool = io_pool if io_pool is not None else _get_shared_io_pool()
         self._io_write_lock = threading.Lock()
         # Reuse the same pool for assorted IO and CPU-light background tasks
         self.io_pool = self.background_pool
@@ -3594,7 +4138,15 @@ class Browser(QMainWindow):
         self.bookmarks_file = os.path.join(self.data_dir, "bookmarks.json")
         self.history_file = os.path.join(self.data_dir, "history.json")
         self.cookies_file = os.path.join(self.data_dir, "cookies.json")
-        self.session_file = os.path.join(self.data_dir, "session.json")
+        self.session_file = os.path.join(self.data_dir, "session.json")  # legacy snapshot, read-only now
+        # Session log: one JSON line per tab upsert/close, replayed on restore
+        self.session_log_file = os.path.join(self.data_dir, "session.jsonl")
+        self._session_log = None
+        self._session_log_current = False  # False until this run has truncated or rewritten the log
+        self._session_log_size = 0  # approximate, tracked on the GUI thread to trigger compaction
+        self._session_ids = itertools.count(1)
+        # One writer thread keeps appends and snapshot rewrites in order, off the GUI thread
+        self._session_io = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="surfscape-session")
 
         # Initialize settings manager
         self.settings_manager = SettingsManager(self.data_dir)
@@ -3631,15 +4183,33 @@ class Browser(QMainWindow):
 
         # Deferred JSON loads (faster perceived startup)
         self.bookmarks = []
-        self.history = []
-        self.cookies = []
-        QTimer.singleShot(50, lambda: self._deferred_load_json('bookmarks'))
-        QTimer.singleShot(80, lambda: self._deferred_load_json('history'))
-        QTimer.singleShot(110, lambda: self._deferred_load_json('cookies'))
-        QTimer.singleShot(120, self.update_url_autocomplete)
-
-        # Legacy flat settings
-        self.settings = self.load_json(os.path.join(self.data_dir, 'settings.json'))
+        self._bookmark_urls: set[str] = set()  # O(1) "is this URL bookmarked" for the URL bar
+        self._history_view = None  # History menu widgets, built on first use
+        self._bookmarks_view = None  # Bookmarks menu widgets, built on first use
+        self._cookies_view = None  # Cookies menu widgets, built on first use
+        # Coalesces bursts of history/bookmark changes into one URL completer rebuild
+        self._url_ac_timer = QTimer(self)
+        self._url_ac_timer.setSingleShot(True)
+        self._url_ac_timer.timeout.connect(self._do_update_url_autocomplete)
+        # Frequent bookmark/history/cookie changes mark their file dirty; the timer writes them in one batch
+        self._dirty_json: set[str] = set()
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(2000)
+        self._save_timer.timeout.connect(self._flush_json_saves)
+        self._history_removals: set[str] = set()  # URLs unchecked in a history list, applied in one pass
+        self._prefetched_hosts: OrderedDict[str, None] = OrderedDict()  # LRU of hosts sent to adblock prefetch
+        # Created on demand (AI panel) or by the deferred menu build (bookmark import/export)
+        self.splitter = None
+        self.ai_widget = None
+        self.action_import_bookmarks = None
+        self.action_export_bookmarks = None
+        # History and cookies are rolling logs: bounded deques evict the oldest entry on append
+        self.history = deque(maxlen=self._STARTUP_JSON_LIMITS['history'])
+        self.cookies = deque(maxlen=self._STARTUP_JSON_LIMITS['cookies'])
+        self._cookies_by_key: dict[tuple, dict] = {}  # (name, domain, path) -> entry in self.cookies
+        for which in ('bookmarks', 'history', 'cookies'):
+            self._deferred_load_json(which)
 
         # URL bar
         self.url_bar = QLineEdit()
@@ -3659,8 +4229,22 @@ class Browser(QMainWindow):
         except Exception:
             pass
         self._favicon_manager = QNetworkAccessManager(self)
+        try:
+            favicon_http_cache = QNetworkDiskCache(self)
+            favicon_http_cache.setCacheDirectory(os.path.join(self.data_dir, 'favicon_http_cache'))
+            favicon_http_cache.setMaximumCacheSize(8 * 1024 * 1024)
+            self._favicon_manager.setCache(favicon_http_cache)
+        except Exception as exc:
+            print(f"Favicon HTTP cache unavailable: {exc}")
+        # Fetches are queued and drained in short batches so restored sessions share connections
+        self._favicon_queue = deque()
+        self._favicon_inflight = 0
+        self._favicon_max_inflight = 6
+        self._favicon_drain_scheduled = False
+        # Icons live in one SQLite store; per-host PNGs in favicon_dir are only read to migrate old caches
         self.favicon_dir = os.path.join(self.data_dir, 'favicons')
-        os.makedirs(self.favicon_dir, exist_ok=True)
+        self._favicon_db = self._open_favicon_db(os.path.join(self.data_dir, 'favicons.db'))
+        QPixmapCache.setCacheLimit(2048)
 
         # Lazy heavy components
         self.download_manager = None
@@ -3693,6 +4277,9 @@ class Browser(QMainWindow):
                 self.fast_start = env_val_l not in ("0", "false", "no", "off", "disable", "disabled")
         # Optional detailed page performance tracing (disabled by default)
         self.perf_trace = os.environ.get("SURFSCAPE_TRACE_PAGE", "").lower() in ("1","true","yes","on")
+        if self.perf_trace:
+            self._install_perf_probe(self.default_profile)
+            self._install_perf_probe(self.private_profile)
 
         # Kick off adblock init (deferred if fast start to unblock UI sooner)
         cache_path = os.path.join(self.data_dir, 'adblock_lists.cache')
@@ -3721,9 +4308,15 @@ class Browser(QMainWindow):
         else:
             QTimer.singleShot(homepage_delay, lambda: self.add_new_tab(QUrl(self.homepage_url), "Homepage"))
 
-        # Menus / shortcuts
+        # Menus / shortcuts: File/Edit/View and the toolbar are built now; the remaining
+        # menus and the shortcuts follow on the first event-loop tick when fast start is on
         self.create_menu_bar()
-        self.create_shortcuts()
+        if self.fast_start:
+            QTimer.singleShot(0, self._create_menu_bar_rest)
+            QTimer.singleShot(0, self.create_shortcuts)
+        else:
+            self._create_menu_bar_rest()
+            self.create_shortcuts()
 
         # Deferred cookie store sync (later if fast start)
         QTimer.singleShot(400 if self.fast_start else 250, self.load_cookies_to_web_engine)
@@ -3734,24 +4327,36 @@ class Browser(QMainWindow):
 
         # DevTools loads lazily on first open
 
-    def _deferred_load_json(self, which: str):
-        file_map = {
-            'bookmarks': (self.bookmarks_file, 500, 'bookmarks'),
-            'history': (self.history_file, 1000, 'history'),
-            'cookies': (self.cookies_file, 500, 'cookies'),
-        }
-        target = file_map.get(which)
-        if not target:
-            return
-        path_value, limit, attr = target
+    # Entries kept in memory for each startup JSON file
+    _STARTUP_JSON_LIMITS = {'bookmarks': 500, 'history': 1000, 'cookies': 500}
 
-        try:
-            result = self.load_json(path_value)
-        except Exception as exc:
-            print(f'Failed to load {attr}: {exc}')
+    def _deferred_load_json(self, which: str):
+        """Read and parse a startup JSON file on the IO pool; results are applied on the UI thread."""
+        if which not in self._STARTUP_JSON_LIMITS:
             return
-        data = (result or [])[-limit:]
-        setattr(self, attr, data)
+        path_value = getattr(self, f'{which}_file')
+        callback = lambda result, w=which: self._apply_loaded_json(w, result)
+        if self.io_pool.submit(_read_json_file, path_value, callback=callback) is None:
+            try:
+                result = _read_json_file(path_value)
+            except Exception as exc:
+                result = exc
+            callback(result)
+
+    def _apply_loaded_json(self, attr: str, result):
+        if isinstance(result, Exception):
+            print(f'Failed to load {attr}: {result}')
+            result = []
+        limit = self._STARTUP_JSON_LIMITS[attr]
+        if attr == 'bookmarks':
+            self.bookmarks = (result or [])[-limit:]
+            self._sync_bookmark_urls()
+        else:
+            rolling = getattr(self, attr)
+            rolling.clear()
+            rolling.extend(result or [])
+            if attr == 'cookies':
+                self._sync_cookie_index()
         if attr == 'bookmarks' and hasattr(self, 'bookmarks_menu'):
             self._populate_bookmarks_menu()
         if attr == 'history' and hasattr(self, 'history_menu'):
@@ -3792,19 +4397,34 @@ class Browser(QMainWindow):
 
     def load_json(self, file_path):
         """Load data from a JSON file, or return an empty list if the file doesn't exist."""
-        if not os.path.exists(file_path):
-            return []
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _read_json_file(file_path)
         except Exception as exc:
             print(f"Warning: failed to load JSON data from {file_path}: {exc}")
             return []
 
+    def _mark_json_dirty(self, which: str):
+        """Queue self.<which> for the next batched save (at most 2 s away)."""
+        self._dirty_json.add(which)
+        if not self._save_timer.isActive():
+            self._save_timer.start()
+
+    def _flush_json_saves(self):
+        """Write every data file marked dirty since the last flush."""
+        self._save_timer.stop()
+        dirty, self._dirty_json = self._dirty_json, set()
+        for which in dirty:
+            self.save_json(getattr(self, f"{which}_file"), getattr(self, which))
+
     def save_json(self, file_path, data):
         """Persist JSON data without blocking the UI thread."""
+        if isinstance(data, deque):
+            data = list(data)
         try:
-            payload = json.dumps(data, indent=4)
+            if orjson is not None:
+                payload = orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+            else:
+                payload = json.dumps(data, indent=4)
         except Exception as exc:
             print(f'Failed to serialize {file_path}: {exc}')
             return
@@ -3874,6 +4494,8 @@ class Browser(QMainWindow):
             self.tabs.setCurrentIndex(tab_index)
 
         browser.urlChanged.connect(lambda qurl, b=browser: self.update_urlbar(qurl, b))
+        browser.urlChanged.connect(lambda _qurl, b=browser: self._log_session_tab(b))
+        browser.titleChanged.connect(lambda _title, b=browser: self._log_session_tab(b))
         browser.urlChanged.connect(lambda qurl, i=tab_index: self._update_tab_favicon(i, qurl))
         browser.loadFinished.connect(lambda ok, i=tab_index, b=browser: self._on_tab_load_finished(i, b, ok))
         browser.loadStarted.connect(lambda b=browser: self._on_tab_load_started(b))
@@ -4168,6 +4790,9 @@ class Browser(QMainWindow):
         closing_view = self.tabs.widget(i)
         if isinstance(closing_view, CustomWebEngineView):
             self.tab_loading_pool.discard(closing_view)
+            session_id = getattr(closing_view, '_session_id', None)
+            if session_id is not None:
+                self._append_session_record({"op": "close", "id": session_id})
         self.tabs.removeTab(i)
         current_view = self._current_web_view()
         self._update_status_from_view(current_view)
@@ -4231,28 +4856,72 @@ class Browser(QMainWindow):
             return str(url).lower()
 
     def _favicon_path_for_key(self, key: str) -> str:
-        safe = re.sub(r"[^a-z0-9_.-]", "_", key)
-        return os.path.join(self.favicon_dir, f"{safe}.png")
+        return os.path.join(self.favicon_dir, f"{_favicon_safe_name(key)}.png")
+
+    def _open_favicon_db(self, path: str):
+        try:
+            db = sqlite3.connect(path, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("CREATE TABLE IF NOT EXISTS favicons(host TEXT PRIMARY KEY, png BLOB, ts INTEGER)")
+            return db
+        except Exception as e:
+            print(f"Favicon store unavailable: {e}")
+            return None
+
+    def _store_favicon(self, key: str, img: QImage) -> bool:
+        """Persist an already-sanitized icon image as PNG bytes; returns True once stored."""
+        db = self._favicon_db
+        if db is None:
+            return False
+        try:
+            data = QByteArray()
+            buf = QBuffer(data)
+            buf.open(QIODevice.OpenModeFlag.WriteOnly)
+            img.save(buf, "PNG")
+            buf.close()
+            db.execute("INSERT OR REPLACE INTO favicons(host, png, ts) VALUES (?, ?, ?)", (key, data.data(), int(time.time())))
+            return True
+        except Exception as e:
+            print(f"Favicon store write failed: {e}")
+            return False
 
     def _favicon_from_disk(self, key: str) -> QIcon | None:
+        pixmap_key = f"favicon:{key}"
+        pm = QPixmapCache.find(pixmap_key)
+        if pm is not None and not pm.isNull():
+            return QIcon(pm)
+        db = self._favicon_db
+        if db is not None:
+            try:
+                row = db.execute("SELECT png FROM favicons WHERE host = ?", (key,)).fetchone()
+            except Exception:
+                row = None
+            if row and row[0]:
+                img = QImage()
+                if img.loadFromData(row[0]):
+                    pm = QPixmap.fromImage(img)
+                    QPixmapCache.insert(pixmap_key, pm)
+                    return QIcon(pm)
+        # Legacy per-host PNG file from older versions
         path = self._favicon_path_for_key(key)
         if os.path.exists(path):
             try:
                 pm = QPixmap(path)
                 if pm.isNull():
                     return None
-                # Recreate QImage to ensure it's sane, then repack as PNG if needed
                 img = pm.toImage()
                 if img.isNull():
                     return None
-                # If the file might be problematic, re-encode once
-                try:
-                    writer = QImageWriter(path, b"png")
-                    writer.setQuality(100)
-                    writer.write(img)
-                except Exception:
-                    pass
-                return QIcon(QPixmap.fromImage(img))
+                # One-time migration: the store re-encodes it as a clean PNG, so the
+                # legacy file is dropped and never decoded or rewritten again
+                if self._store_favicon(key, img):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                QPixmapCache.insert(f"favicon:{key}", pm)
+                return QIcon(pm)
             except Exception:
                 return None
         return None
@@ -4269,7 +4938,7 @@ class Browser(QMainWindow):
         return None
 
     def _fetch_favicon(self, url: str, key: str, callbacks: list):
-        """Fetch favicon.ico for host; on load, save to disk, update callbacks.
+        """Queue a favicon fetch for host; on load, save to disk, update callbacks.
         callbacks: list of callables taking (QIcon)
         """
         # If already pending, queue callbacks
@@ -4277,7 +4946,27 @@ class Browser(QMainWindow):
             self._favicon_pending[key].extend(callbacks)
             return
         self._favicon_pending[key] = list(callbacks)
-
+        self._favicon_queue.append((url, key))
+        if not self._favicon_drain_scheduled:
+            self._favicon_drain_scheduled = True
+            QTimer.singleShot(50, self._drain_favicon_queue)
+
+    def _drain_favicon_queue(self):
+        """Start queued favicon fetches up to the in-flight cap."""
+        self._favicon_drain_scheduled = False
+        queue = self._favicon_queue
+        while queue and self._favicon_inflight < self._favicon_max_inflight:
+            url, key = queue.popleft()
+            self._favicon_inflight += 1
+            self._start_favicon_fetch(url, key)
+
+    def _favicon_fetch_done(self):
+        self._favicon_inflight = max(0, self._favicon_inflight - 1)
+        if self._favicon_queue and not self._favicon_drain_scheduled:
+            self._favicon_drain_scheduled = True
+            QTimer.singleShot(0, self._drain_favicon_queue)
+
+    def _start_favicon_fetch(self, url: str, key: str):
         # Build common favicon locations
         q = QUrl(url)
         if not q.scheme():
@@ -4300,18 +4989,12 @@ class Browser(QMainWindow):
                         cb(icon)
                     except Exception:
                         pass
+                self._favicon_fetch_done()
                 return
 
             req = QNetworkRequest(candidates[i])
-            # Prefer HTTP/1.1 for small icon fetches to avoid some HTTP/2 edge cases
-            try:
-                attr = getattr(QNetworkRequest.Attribute, 'HTTP2AllowedAttribute', None)
-                if attr is None:
-                    attr = getattr(QNetworkRequest.Attribute, 'Http2AllowedAttribute', None)
-                if attr is not None:
-                    req.setAttribute(attr, False)
-            except Exception:
-                pass
+            # HTTP/2 stays enabled so icons for the same host multiplex over one connection
+            req.setAttribute(QNetworkRequest.Attribute.CacheLoadControlAttribute, QNetworkRequest.CacheLoadControl.PreferCache)
             reply = self._favicon_manager.get(req)
 
             def on_finished():
@@ -4338,27 +5021,30 @@ class Browser(QMainWindow):
                             return
                         data = reply.readAll()
                         # Hard limit if no Content-Length header
-                        if len(data) > 1024 * 1024:
+                        if data.size() > 1024 * 1024:
                             # Too large; let finally advance to next
                             return
-                        # Decode using QImage to sanitize metadata
-                        img = QImage()
-                        img.loadFromData(bytes(data))
+                        # Decode straight from the QByteArray (no bytes() copy), scaling to
+                        # 16x16 during the decode for consistent UI and to avoid very large icons
+                        buf = QBuffer(data)
+                        buf.open(QIODevice.OpenModeFlag.ReadOnly)
+                        reader = QImageReader(buf)
+                        size = reader.size()
+                        if size.isValid() and size.width() > 0 and size.height() > 0:
+                            reader.setScaledSize(size.scaled(16, 16, Qt.AspectRatioMode.KeepAspectRatio))
+                        img = reader.read()
+                        buf.close()
                         if img.isNull():
                             # Invalid image; let finally advance to next
                             return
-                        # Normalize size to 16x16 for consistent UI and to avoid very large icons
-                        if img.width() > 0 and img.height() > 0:
+                        if not size.isValid() and img.width() > 0 and img.height() > 0:
+                            # Formats that can't report their size up front are scaled after decoding
                             img = img.scaled(16, 16, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                        # Save to disk as clean PNG (re-encoded) to avoid libpng warnings
-                        path = self._favicon_path_for_key(key)
-                        try:
-                            writer = QImageWriter(path, b"png")
-                            writer.setQuality(100)
-                            writer.write(img)
-                        except Exception:
-                            pass
-                        icon = QIcon(QPixmap.fromImage(img))
+                        # Persist as clean PNG (re-encoded) to avoid libpng warnings
+                        self._store_favicon(key, img)
+                        pm = QPixmap.fromImage(img)
+                        QPixmapCache.insert(f"favicon:{key}", pm)
+                        icon = QIcon(pm)
                         self._favicon_cache[key] = icon
                         for cb in self._favicon_pending.pop(key, []):
                             try:
@@ -4366,12 +5052,16 @@ class Browser(QMainWindow):
                             except Exception:
                                 pass
                         ok = True
+                        self._favicon_fetch_done()
                         return
                 finally:
                     reply.deleteLater()
                     # If not successful, move to next candidate
-                    if not ok and key in self._favicon_pending:
-                        try_next(i + 1)
+                    if not ok:
+                        if key in self._favicon_pending:
+                            try_next(i + 1)
+                        else:
+                            self._favicon_fetch_done()
 
             reply.finished.connect(on_finished)
 
@@ -4384,6 +5074,11 @@ class Browser(QMainWindow):
         if key in self._favicon_cache:
             apply_icon(self._favicon_cache[key])
             return
+        # Another row/tab on the same host is already waiting; join it instead of probing disk again
+        pending = self._favicon_pending.get(key)
+        if pending is not None:
+            pending.append(apply_icon)
+            return
         # Disk cache
         icon = self._favicon_from_disk(key)
         if icon:
@@ -4433,11 +5128,11 @@ class Browser(QMainWindow):
         # File menu
         file_menu = menu_bar.addMenu("File")
         new_tab_action = QAction("New Tab", self)
-        new_tab_action.triggered.connect(lambda _: self.add_new_tab())
+        new_tab_action.triggered.connect(self._new_tab)
         file_menu.addAction(new_tab_action)
         
         new_private_tab_action = QAction("New Private Tab", self)
-        new_private_tab_action.triggered.connect(lambda: self.add_private_tab())
+        new_private_tab_action.triggered.connect(self._new_private_tab)
         file_menu.addAction(new_private_tab_action)
         
         file_menu.addSeparator()
@@ -4490,7 +5185,7 @@ class Browser(QMainWindow):
         
         zoom_out_action = QAction("Zoom Out", self)
         zoom_out_action.triggered.connect(self.zoom_out)
-        zoom_out_action.setShortcut(QKeySequence("Ctrl+_"))
+        zoom_out_action.setShortcut(_keyseq("Ctrl+_"))
         view_menu.addAction(zoom_out_action)
         
         zoom_reset_action = QAction("Reset Zoom", self)
@@ -4509,6 +5204,48 @@ class Browser(QMainWindow):
         view_source_action.triggered.connect(self.view_source)
         view_menu.addAction(view_source_action)
         
+        # Navigation bar
+        navtb = QToolBar("Navigation")
+        navtb.setMovable(False)  # Disable detachable toolbar
+        self.addToolBar(navtb)
+
+        self.back_button = QAction("←", self)
+        self.back_button.triggered.connect(self.navigate_back)
+        navtb.addAction(self.back_button)
+
+        self.forward_button = QAction("→", self)
+        self.forward_button.triggered.connect(self.navigate_forward)
+        navtb.addAction(self.forward_button)
+
+        self.reload_button = QAction("⟳", self)
+        self.reload_button.triggered.connect(self.refresh_current_tab)
+        navtb.addAction(self.reload_button)
+
+        self.home_button = QAction("Home", self)
+        self.home_button.triggered.connect(self.navigate_home)
+        navtb.addAction(self.home_button)
+
+        self.url_bar.returnPressed.connect(self.navigate_to_url)
+        navtb.addWidget(self.url_bar)
+
+        self.bookmark_button = QAction("☆", self)
+        self.bookmark_button.triggered.connect(self.toggle_bookmark)
+        # Reset the bookmark button state when the URL changes (connected once)
+        self.url_bar.textChanged.connect(self.reset_bookmark_button)
+        navtb.addAction(self.bookmark_button)
+        
+        self.ai_button = QAction("Ai", self)
+        self.ai_button.triggered.connect(self.show_ai_widget)
+        navtb.addAction(self.ai_button)
+        
+        self.settings_button = QAction("⚙", self)
+        self.settings_button.triggered.connect(self.show_settings_dialog)
+        navtb.addAction(self.settings_button)
+
+    def _create_menu_bar_rest(self):
+        """Menus that are not needed for the first paint; their content is filled on aboutToShow."""
+        menu_bar = self.menuBar()
+
         # History menu (before Bookmarks)
         self.history_menu = menu_bar.addMenu("History")
         self.history_menu.aboutToShow.connect(self.update_history_menu)
@@ -4523,7 +5260,6 @@ class Browser(QMainWindow):
         self.action_export_bookmarks = QAction("Export Bookmarks...", self)
         self.action_export_bookmarks.triggered.connect(self.export_bookmarks)
         self.bookmarks_menu.addAction(self.action_export_bookmarks)
-        self.bookmarks_menu.addSeparator()
         self.bookmarks_menu.aboutToShow.connect(self._populate_bookmarks_menu)
 
         # Cookies menu
@@ -4548,64 +5284,42 @@ class Browser(QMainWindow):
         about_action.triggered.connect(self.show_about_dialog)
         help_menu.addAction(about_action)
 
-        # Navigation bar
-        navtb = QToolBar("Navigation")
-        navtb.setMovable(False)  # Disable detachable toolbar
-        self.addToolBar(navtb)
-
-        self.back_button = QAction("←", self)
-        self.back_button.triggered.connect(self.navigate_back)
-        navtb.addAction(self.back_button)
-
-        self.forward_button = QAction("→", self)
-        self.forward_button.triggered.connect(self.navigate_forward)
-        navtb.addAction(self.forward_button)
+    # Zero-argument slots so menu actions and shortcuts connect to bound methods, not lambdas
+    def _new_tab(self):
+        self.add_new_tab()
 
-        self.reload_button = QAction("⟳", self)
-        self.reload_button.triggered.connect(self.refresh_current_tab)
-        navtb.addAction(self.reload_button)
+    def _new_private_tab(self):
+        self.add_private_tab()
 
-        self.home_button = QAction("Home", self)
-        self.home_button.triggered.connect(self.navigate_home)
-        navtb.addAction(self.home_button)
-
-        self.url_bar.returnPressed.connect(self.navigate_to_url)
-        navtb.addWidget(self.url_bar)
-
-        self.bookmark_button = QAction("☆", self)
-        self.bookmark_button.triggered.connect(self.toggle_bookmark)
-        navtb.addAction(self.bookmark_button)
-        
-        self.ai_button = QAction("Ai", self)
-        self.ai_button.triggered.connect(self.show_ai_widget)
-        navtb.addAction(self.ai_button)
-        
-        self.settings_button = QAction("⚙", self)
-        self.settings_button.triggered.connect(self.show_settings_dialog)
-        navtb.addAction(self.settings_button)
+    def _close_current_tab(self):
+        self.close_current_tab(self.tabs.currentIndex())
 
     def create_shortcuts(self):
         # Apply default shortcuts (can be overridden by settings)
-        QShortcut(QKeySequence("Ctrl+T"), self).activated.connect(lambda: self.add_new_tab())
-        QShortcut(QKeySequence("Ctrl+Q"), self).activated.connect(lambda: self.close_current_tab(self.tabs.currentIndex()))
-        QShortcut(QKeySequence("Ctrl+R"), self).activated.connect(self.refresh_current_tab)
-        QShortcut(QKeySequence("F5"), self).activated.connect(self.refresh_current_tab)
-        QShortcut(QKeySequence("Alt+Home"), self).activated.connect(self.navigate_home)
-        QShortcut(QKeySequence("Alt+Left"), self).activated.connect(self.navigate_back)
-        QShortcut(QKeySequence("Alt+Right"), self).activated.connect(self.navigate_forward)
-        QShortcut(QKeySequence("Ctrl+D"), self).activated.connect(self.toggle_bookmark)
-        QShortcut(QKeySequence("Ctrl+F"), self).activated.connect(self.show_find_dialog)
-        QShortcut(QKeySequence("Ctrl+="), self).activated.connect(self.zoom_in)
-        QShortcut(QKeySequence("Ctrl+0"), self).activated.connect(self.zoom_reset)
-        QShortcut(QKeySequence("F11"), self).activated.connect(self.toggle_fullscreen)
-        QShortcut(QKeySequence("Ctrl+U"), self).activated.connect(self.view_source)
-        QShortcut(QKeySequence("Ctrl+P"), self).activated.connect(self.print_page)
-        QShortcut(QKeySequence("Ctrl+Shift+N"), self).activated.connect(lambda: self.add_private_tab())
+        default_shortcuts = (
+            ("Ctrl+T", self._new_tab),
+            ("Ctrl+Q", self._close_current_tab),
+            ("Ctrl+R", self.refresh_current_tab),
+            ("F5", self.refresh_current_tab),
+            ("Alt+Home", self.navigate_home),
+            ("Alt+Left", self.navigate_back),
+            ("Alt+Right", self.navigate_forward),
+            ("Ctrl+D", self.toggle_bookmark),
+            ("Ctrl+F", self.show_find_dialog),
+            ("Ctrl+=", self.zoom_in),
+            ("Ctrl+0", self.zoom_reset),
+            ("F11", self.toggle_fullscreen),
+            ("Ctrl+U", self.view_source),
+            ("Ctrl+P", self.print_page),
+            ("Ctrl+Shift+N", self._new_private_tab),
+        )
+        for key, method in default_shortcuts:
+            QShortcut(_keyseq(key), self, method)
         
         # Add AI assistant shortcut
         ai_shortcut = self.settings_manager.get('shortcuts.ai_assistant', 'Ctrl+Shift+A')
         if ai_shortcut:
-            QShortcut(QKeySequence(ai_shortcut), self).activated.connect(self.show_ai_widget)
+            QShortcut(_keyseq(ai_shortcut), self, self.show_ai_widget)
         
         # Apply all custom shortcuts from settings
         self._apply_custom_shortcuts()
@@ -4613,50 +5327,21 @@ class Browser(QMainWindow):
     def _apply_custom_shortcuts(self):
         """Apply custom keyboard shortcuts from settings"""
         shortcuts = self.settings_manager.get('shortcuts', {})
-        
-        # Map of action names to methods
-        action_map = {
-            'new_tab': lambda: self.add_new_tab(),
-            'close_tab': lambda: self.close_current_tab(self.tabs.currentIndex()),
-            'reload': self.refresh_current_tab,
-            'hard_reload': self.refresh_current_tab,
-            'find': self.show_find_dialog,
-            'zoom_in': self.zoom_in,
-            'zoom_out': self.zoom_out,
-            'zoom_reset': self.zoom_reset,
-            'home': self.navigate_home,
-            'back': self.navigate_back,
-            'forward': self.navigate_forward,
-            'bookmark': self.toggle_bookmark,
-            'bookmarks': lambda: None,  # Placeholder for bookmarks manager
-            'history': lambda: None,  # Placeholder for history manager
-            'downloads': self.show_download_manager,
-            'settings': self.show_settings_dialog,
-            'view_source': self.view_source,
-            'fullscreen': self.toggle_fullscreen,
-            'private_tab': lambda: self.add_private_tab()
-        }
-        
-        # Apply shortcuts (skip ones already handled by default shortcuts)
-        skip_defaults = {'new_tab', 'close_tab', 'reload', 'find', 'zoom_in', 'zoom_reset', 
-                        'home', 'back', 'forward', 'bookmark', 
-                        'view_source', 'fullscreen', 'private_tab'}
-        
-        for action, method in action_map.items():
-            if action in skip_defaults:
-                continue
+        if not shortcuts:
+            return
+        # Only actions without a built-in default shortcut are bound here
+        for action, method_name in _CUSTOM_SHORTCUT_ACTIONS:
             shortcut_key = shortcuts.get(action)
-            if shortcut_key and method:
+            if shortcut_key:
                 try:
-                    QShortcut(QKeySequence(shortcut_key), self).activated.connect(method)
+                    QShortcut(_keyseq(shortcut_key), self, getattr(self, method_name))
                 except Exception as e:
                     print(f"Failed to set shortcut {shortcut_key} for {action}: {e}")
 
     def toggle_bookmark(self):
         url = self.url_bar.text()
-        if url in [bookmark[1] for bookmark in self.bookmarks]:
-            # Remove existing bookmark
-            self.bookmarks = [bookmark for bookmark in self.bookmarks if bookmark[1] != url]
+        if self._bookmark_remove(url):
+            # Removed existing bookmark
             self.bookmark_button.setIconText("☆")  # Set to unpressed state
         else:
             # Add new bookmark
@@ -4667,18 +5352,45 @@ class Browser(QMainWindow):
                     title = current_widget.page().title() or title
                 except Exception:
                     title = url
-            self.bookmarks.append([title, url])
+            self._bookmark_add(title, url)
             self.bookmark_button.setIconText("★")  # Change to pressed state
-        self.save_json(self.bookmarks_file, self.bookmarks)  # Save bookmarks
+        self._mark_json_dirty('bookmarks')  # Save bookmarks
 
-        # Reset the bookmark button state when the URL changes
-        self.url_bar.textChanged.connect(self.reset_bookmark_button)
         # Refresh menu UI
         self._populate_bookmarks_menu()
 
+    def _bookmark_add(self, title: str, url: str) -> bool:
+        """Append a bookmark unless its URL is already bookmarked; keeps _bookmark_urls in sync."""
+        if not url or url in self._bookmark_urls:
+            return False
+        self.bookmarks.append([title or url, url])
+        self._bookmark_urls.add(url)
+        return True
+
+    def _bookmark_remove(self, url: str) -> bool:
+        """Drop every bookmark for url in one pass; returns False if it wasn't bookmarked."""
+        if url not in self._bookmark_urls:
+            return False
+        self.bookmarks = [bookmark for bookmark in self.bookmarks if bookmark[1] != url]
+        self._bookmark_urls.discard(url)
+        return True
+
+    def _sync_bookmark_urls(self):
+        """Rebuild the bookmarked-URL set after bulk changes to self.bookmarks."""
+        self._bookmark_urls = {bookmark[1] for bookmark in self.bookmarks}
+
+    def _sync_cookie_index(self):
+        """Rebuild the (name, domain, path) cookie index after bulk changes to self.cookies."""
+        index = {}
+        for cookie in self.cookies:
+            try:
+                index[_COOKIE_KEY(cookie)] = cookie
+            except (KeyError, TypeError):
+                continue
+        self._cookies_by_key = index
+
     def reset_bookmark_button(self):
-        url = self.url_bar.text()
-        if url not in [bookmark[1] for bookmark in self.bookmarks]:
+        if self.url_bar.text() not in self._bookmark_urls:
             self.bookmark_button.setIconText("☆")  # Set to unpressed state
             
     def show_ai_widget(self):
@@ -4688,7 +5400,7 @@ class Browser(QMainWindow):
             return
         
         # Check if we already have a splitter and AI widget
-        if not hasattr(self, 'splitter'):
+        if self.splitter is None:
             # Get AI panel configuration from settings
             panel_position = self.settings_manager.get('ai_panel_position', 'right')
             panel_width = self.settings_manager.get('ai_panel_width', 0.3)
@@ -4780,189 +5492,181 @@ class Browser(QMainWindow):
         url = self.url_bar.text()
         if url != "about:blank":
             self.history.append((title, url))
-            self.history = self.history[-1000:]  # Keep only the last 1000 entries
             self.update_history_menu()
-            self.save_json(self.history_file, self.history)  # Save history
+            self._mark_json_dirty('history')  # Save history
 
-    def update_history_menu(self):
-        """Update the History menu with a scrollable list of entries."""
+    def _ensure_history_menu(self):
+        """Build the History menu's search field and list view once; later refreshes only reset the model."""
+        if self._history_view is not None:
+            return
+        from PyQt6.QtWidgets import QWidgetAction
+        # Drop any fallback actions left by an earlier failed build
         self.history_menu.clear()
+        # Search field (above the list) that filters in place
+        search_line = QLineEdit()
+        search_line.setPlaceholderText("Search history…")
         try:
-            from PyQt6.QtWidgets import QListWidget, QWidgetAction, QListWidgetItem, QLineEdit
-            from PyQt6.QtCore import Qt
-            # Search field (above the list) that filters in place
-            search_line = QLineEdit()
-            search_line.setPlaceholderText("Search history…")
-            try:
-                search_line.setClearButtonEnabled(True)
-            except Exception:
-                pass
-            search_action = QWidgetAction(self.history_menu)
-            search_action.setDefaultWidget(search_line)
-            self.history_menu.addAction(search_action)
-
-            # Create list widget
-            history_list = QListWidget()
-            history_list.setSelectionMode(QListWidget.SelectionMode.SingleSelection)
-            history_list.setMinimumWidth(420)
-            history_list.setMaximumHeight(300)
-            # Enable hover selection
-            try:
-                history_list.setMouseTracking(True)
-                def _history_item_entered(item):
-                    if item is not None:
-                        history_list.setCurrentItem(item)
-                history_list.itemEntered.connect(_history_item_entered)
-            except Exception:
-                pass
+            search_line.setClearButtonEnabled(True)
+        except Exception:
+            pass
 
-            def populate_history(filter_text: str = ""):
-                history_list.clear()
-                ft = (filter_text or "").lower()
-                for title, url in reversed(self.history[-200:]):
-                    display = f"{title} — {url}" if title else url
-                    if not ft or ft in (title or "").lower() or ft in (url or "").lower():
-                        item = QListWidgetItem(display)
-                        item.setData(Qt.ItemDataRole.UserRole, url)
-                        # Set favicon asynchronously
-                        def _apply(icon, item_ref=item):
-                            try:
-                                if item_ref is not None:
-                                    item_ref.setIcon(icon)
-                            except Exception:
-                                pass
-                        self._get_favicon_async(url, _apply)
-                        history_list.addItem(item)
+        model = UrlEntryListModel(self._get_favicon_async, self._favicon_key_for_url, self)
+        proxy = UrlEntryFilterProxy(self)
+        proxy.setSourceModel(model)
+
+        history_view = QListView()
+        history_view.setModel(proxy)
+        history_view.setSelectionMode(QListView.SelectionMode.SingleSelection)
+        history_view.setMinimumWidth(420)
+        history_view.setMaximumHeight(300)
+        _configure_menu_list_view(history_view)
+        # Enable hover selection
+        history_view.setMouseTracking(True)
+        history_view.entered.connect(history_view.setCurrentIndex)
+
+        def on_index_clicked(index):
+            url = index.data(Qt.ItemDataRole.UserRole)
+            if url:
+                self._open_url(url, 'History')
+                self.history_menu.hide()
+
+        def on_search_return():
+            search_timer.stop()
+            proxy.set_needle(search_line.text())
+            if proxy.rowCount() > 0:
+                on_index_clicked(proxy.index(0, 0))
+
+        history_view.clicked.connect(on_index_clicked)
+        # Re-filter once typing pauses rather than on every keystroke
+        search_timer = QTimer(search_line)
+        search_timer.setSingleShot(True)
+        search_timer.setInterval(120)
+        search_timer.timeout.connect(lambda: proxy.set_needle(search_line.text()))
+        search_line.textChanged.connect(lambda _text: search_timer.start())
+        search_line.returnPressed.connect(on_search_return)
+
+        search_action = QWidgetAction(self.history_menu)
+        search_action.setDefaultWidget(search_line)
+        self.history_menu.addAction(search_action)
+        list_action = QWidgetAction(self.history_menu)
+        list_action.setDefaultWidget(history_view)
+        self.history_menu.addAction(list_action)
+
+        self._history_search = search_line
+        self._history_proxy = proxy
+        self._history_model = model
+        self._history_view = history_view
 
-            def on_item_clicked(item):
-                url = item.data(Qt.ItemDataRole.UserRole)
-                if url:
-                    self._open_url(url, 'History')
-                    self.history_menu.hide()
-
-            history_list.itemClicked.connect(on_item_clicked)
-
-            # Wire search to filter the list
-            def on_search_text_changed(text: str):
-                populate_history(text)
-            search_line.textChanged.connect(on_search_text_changed)
-            def on_search_return():
-                if history_list.count() > 0:
-                    item = history_list.item(0)
-                    if item:
-                        on_item_clicked(item)
-            search_line.returnPressed.connect(on_search_return)
-
-            # Initial population
-            populate_history("")
-
-            list_action = QWidgetAction(self.history_menu)
-            list_action.setDefaultWidget(history_list)
-            self.history_menu.addAction(list_action)
+    def update_history_menu(self):
+        """Update the History menu's scrollable list of entries."""
+        try:
+            self._ensure_history_menu()
+            if not self.history_menu.isVisible():
+                # Each time the menu opens it starts unfiltered
+                self._history_search.clear()
+                self._history_proxy.set_needle("")
+            self._history_model.set_entries(itertools.islice(reversed(self.history), 200))
         except Exception:
-                # Fallback to basic actions
-                for title, url in reversed(self.history[-50:]):
-                    history_action = QAction(title or url, self)
-                    history_action.triggered.connect(lambda _, url=url: self._open_url(url, 'History'))
-                    self.history_menu.addAction(history_action)
+            # Fallback to basic actions
+            self.history_menu.clear()
+            self._history_view = None
+            for title, url in itertools.islice(reversed(self.history), 50):
+                history_action = QAction(title or url, self)
+                history_action.triggered.connect(lambda _, url=url: self._open_url(url, 'History'))
+                self.history_menu.addAction(history_action)
         # Keep URL bar autocomplete fresh
         self.update_url_autocomplete()
 
-    def _populate_bookmarks_menu(self):
-        """Populate the Bookmarks menu with a scrollable list of bookmarks."""
-        # Clear and rebuild menu content
+    def _ensure_bookmarks_menu(self):
+        """Add the Bookmarks menu's search field and list view (below the static actions) once."""
+        if self._bookmarks_view is not None:
+            return
+        from PyQt6.QtWidgets import QWidgetAction
+        # Drop any fallback actions left by an earlier failed build, keeping import/export on top
         self.bookmarks_menu.clear()
-        # Static actions
-        if hasattr(self, 'action_import_bookmarks'):
+        if self.action_import_bookmarks is not None:
             self.bookmarks_menu.addAction(self.action_import_bookmarks)
-        if hasattr(self, 'action_export_bookmarks'):
+        if self.action_export_bookmarks is not None:
             self.bookmarks_menu.addAction(self.action_export_bookmarks)
         # Inline bookmarks search (below Export Bookmarks). Filter in-menu list, no popup.
+        search_line = QLineEdit()
+        search_line.setPlaceholderText("Search bookmarks…")
         try:
-            from PyQt6.QtWidgets import QLineEdit, QWidgetAction
-            search_line = QLineEdit()
-            search_line.setPlaceholderText("Search bookmarks…")
-            try:
-                search_line.setClearButtonEnabled(True)
-            except Exception:
-                pass
-            search_action = QWidgetAction(self.bookmarks_menu)
-            search_action.setDefaultWidget(search_line)
-            self.bookmarks_menu.addAction(search_action)
+            search_line.setClearButtonEnabled(True)
         except Exception:
-            search_line = None
+            pass
 
+        model = UrlEntryListModel(self._get_favicon_async, self._favicon_key_for_url, self)
+        proxy = UrlEntryFilterProxy(self)
+        proxy.setSourceModel(model)
+
+        bookmarks_view = QListView()
+        bookmarks_view.setModel(proxy)
+        bookmarks_view.setSelectionMode(QListView.SelectionMode.SingleSelection)
+        bookmarks_view.setMinimumWidth(420)
+        bookmarks_view.setMaximumHeight(300)
+        _configure_menu_list_view(bookmarks_view)
+        # Enable hover selection
+        bookmarks_view.setMouseTracking(True)
+        bookmarks_view.entered.connect(bookmarks_view.setCurrentIndex)
+
+        def on_index_clicked(index):
+            url = index.data(Qt.ItemDataRole.UserRole)
+            if url:
+                self._open_url(url, 'Bookmark')
+                # Close the menu after selection
+                self.bookmarks_menu.hide()
+
+        def on_search_return():
+            # Navigate to the first visible item if any
+            search_timer.stop()
+            proxy.set_needle(search_line.text())
+            if proxy.rowCount() > 0:
+                on_index_clicked(proxy.index(0, 0))
+
+        bookmarks_view.clicked.connect(on_index_clicked)
+        # Re-filter once typing pauses rather than on every keystroke
+        search_timer = QTimer(search_line)
+        search_timer.setSingleShot(True)
+        search_timer.setInterval(120)
+        search_timer.timeout.connect(lambda: proxy.set_needle(search_line.text()))
+        search_line.textChanged.connect(lambda _text: search_timer.start())
+        search_line.returnPressed.connect(on_search_return)
+
+        search_action = QWidgetAction(self.bookmarks_menu)
+        search_action.setDefaultWidget(search_line)
+        self.bookmarks_menu.addAction(search_action)
         self.bookmarks_menu.addSeparator()
+        list_action = QWidgetAction(self.bookmarks_menu)
+        list_action.setDefaultWidget(bookmarks_view)
+        self.bookmarks_menu.addAction(list_action)
 
-        # Build a scrollable bookmarks list inside the menu
-        try:
-            # Create list widget
-            bookmarks_list = QListWidget()
-            bookmarks_list.setSelectionMode(QListWidget.SelectionMode.SingleSelection)
-            bookmarks_list.setMinimumWidth(420)
-            bookmarks_list.setMaximumHeight(300)
-            # Enable hover selection
-            try:
-                bookmarks_list.setMouseTracking(True)
-                def _bookmark_item_entered(item):
-                    if item is not None:
-                        bookmarks_list.setCurrentItem(item)
-                bookmarks_list.itemEntered.connect(_bookmark_item_entered)
-            except Exception:
-                pass
-
-            def populate_bookmarks(filter_text: str = ""):
-                bookmarks_list.clear()
-                ft = (filter_text or "").lower()
-                for title, url in self.bookmarks:
-                    display = f"{title} — {url}" if title else url
-                    if not ft or ft in (title or "").lower() or ft in (url or "").lower():
-                        item = QListWidgetItem(display)
-                        item.setData(Qt.ItemDataRole.UserRole, url)
-                        # Set favicon asynchronously
-                        def _apply(icon, item_ref=item):
-                            try:
-                                if item_ref is not None:
-                                    item_ref.setIcon(icon)
-                            except Exception:
-                                pass
-                        self._get_favicon_async(url, _apply)
-                        bookmarks_list.addItem(item)
+        self._bookmarks_search = search_line
+        self._bookmarks_proxy = proxy
+        self._bookmarks_model = model
+        self._bookmarks_view = bookmarks_view
 
-            def on_item_clicked(item):
-                url = item.data(Qt.ItemDataRole.UserRole)
-                if url:
-                    self._open_url(url, 'Bookmark')
-                    # Close the menu after selection
-                    self.bookmarks_menu.hide()
-
-            bookmarks_list.itemClicked.connect(on_item_clicked)
-
-            # Wire search to filter the in-menu list
-            if search_line is not None:
-                def on_search_text_changed(text: str):
-                    populate_bookmarks(text)
-                search_line.textChanged.connect(on_search_text_changed)
-                def on_search_return():
-                    # Navigate to the first visible item if any
-                    if bookmarks_list.count() > 0:
-                        item = bookmarks_list.item(0)
-                        if item:
-                            on_item_clicked(item)
-                search_line.returnPressed.connect(on_search_return)
-
-            # Initial population
-            populate_bookmarks("")
-
-            list_action = QWidgetAction(self.bookmarks_menu)
-            list_action.setDefaultWidget(bookmarks_list)
-            self.bookmarks_menu.addAction(list_action)
-        except Exception as e:
-                # Fallback to simple actions if anything goes wrong
-                for title, url in self.bookmarks:
-                    bookmark_action = QAction(title or url, self)
-                    bookmark_action.triggered.connect(lambda _, url=url: self._open_url(url, 'Bookmark'))
-                    self.bookmarks_menu.addAction(bookmark_action)
+    def _populate_bookmarks_menu(self):
+        """Refresh the Bookmarks menu's list; widgets and connections are created only once."""
+        try:
+            self._ensure_bookmarks_menu()
+            if not self.bookmarks_menu.isVisible():
+                self._bookmarks_search.clear()
+                self._bookmarks_proxy.set_needle("")
+            self._bookmarks_model.set_entries(self.bookmarks)
+        except Exception:
+            # Fallback to simple actions if anything goes wrong
+            self.bookmarks_menu.clear()
+            self._bookmarks_view = None
+            if self.action_import_bookmarks is not None:
+                self.bookmarks_menu.addAction(self.action_import_bookmarks)
+            if self.action_export_bookmarks is not None:
+                self.bookmarks_menu.addAction(self.action_export_bookmarks)
+            self.bookmarks_menu.addSeparator()
+            for title, url in self.bookmarks:
+                bookmark_action = QAction(title or url, self)
+                bookmark_action.triggered.connect(lambda _, url=url: self._open_url(url, 'Bookmark'))
+                self.bookmarks_menu.addAction(bookmark_action)
         # Keep URL bar autocomplete fresh
         self.update_url_autocomplete()
 
@@ -4980,9 +5684,8 @@ class Browser(QMainWindow):
                 return
 
             if file_path.lower().endswith('.html') or (selected_filter and 'HTML' in selected_filter):
-                html = self._export_bookmarks_as_html()
                 with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(html)
+                    self._export_bookmarks_as_html(f)
             else:
                 # Default to JSON
                 with open(file_path, 'w', encoding='utf-8') as f:
@@ -5005,12 +5708,12 @@ class Browser(QMainWindow):
 
             imported = []
             if file_path.lower().endswith('.html') or (selected_filter and 'HTML' in selected_filter):
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    html_text = f.read()
-                imported = self._parse_netscape_bookmarks(html_text)
+                with open(file_path, 'rb') as f:
+                    if os.fstat(f.fileno()).st_size:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                            imported = list(self._parse_netscape_bookmarks(mapped))
             else:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = _read_json_file(file_path)
                 # Expect list of [title, url]
                 if isinstance(data, list):
                     for item in data:
@@ -5021,12 +5724,9 @@ class Browser(QMainWindow):
                 QMessageBox.information(self, "Import Bookmarks", "No bookmarks found to import.")
                 return
 
-            existing_urls = {u for _, u in self.bookmarks}
             added = 0
             for title, url in imported:
-                if url and url not in existing_urls:
-                    self.bookmarks.append([title or url, url])
-                    existing_urls.add(url)
+                if self._bookmark_add(title, url):
                     added += 1
 
             if added:
@@ -5036,74 +5736,121 @@ class Browser(QMainWindow):
         except Exception as e:
             QMessageBox.warning(self, "Import Bookmarks", f"Failed to import bookmarks: {e}")
 
-    def _export_bookmarks_as_html(self) -> str:
-        """Create a simple Netscape-style bookmarks HTML string."""
+    def _export_bookmarks_as_html(self, fp) -> None:
+        """Write a simple Netscape-style bookmarks HTML document to the text file fp."""
         from datetime import datetime
-        lines = [
-            "<!DOCTYPE NETSCAPE-Bookmark-file-1>",
-            "<META HTTP-EQUIV=\"Content-Type\" CONTENT=\"text/html; charset=UTF-8\">",
-            f"<!-- This file was generated by Surfscape on {datetime.now().isoformat()} -->",
-            "<TITLE>Bookmarks</TITLE>",
-            "<H1>Bookmarks</H1>",
-            "<DL><p>"
-        ]
-        for title, url in self.bookmarks:
-            safe_title = (title or url).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-            safe_url = (url or '').replace('"', '&quot;')
-            lines.append(f"    <DT><A HREF=\"{safe_url}\">{safe_title}</A>")
-        lines.append("</DL><p>")
-        return "\n".join(lines)
-
-    def _parse_netscape_bookmarks(self, html_text: str):
-        """Parse a minimal Netscape-style bookmarks HTML and return list of [title, url]."""
-        import re
-        results = []
+        fp.write(
+            "<!DOCTYPE NETSCAPE-Bookmark-file-1>\n"
+            "<META HTTP-EQUIV=\"Content-Type\" CONTENT=\"text/html; charset=UTF-8\">\n"
+            f"<!-- This file was generated by Surfscape on {datetime.now().isoformat()} -->\n"
+            "<TITLE>Bookmarks</TITLE>\n"
+            "<H1>Bookmarks</H1>\n"
+            "<DL><p>\n"
+        )
+        fp.writelines(
+            f"    <DT><A HREF=\"{(url or '').translate(_NETSCAPE_HREF_ESCAPE)}\">{(title or url).translate(_NETSCAPE_TEXT_ESCAPE)}</A>\n"
+            for title, url in self.bookmarks
+        )
+        fp.write("</DL><p>")
+
+    def _parse_netscape_bookmarks(self, html_data):
+        """Yield [title, url] pairs from minimal Netscape-style bookmarks HTML (bytes, mmap or str)."""
+        if isinstance(html_data, str):
+            html_data = html_data.encode('utf-8', errors='ignore')
+        if HTMLParser is not None and len(html_data) >= _SELECTOLAX_MIN_BYTES:
+            # Single C pass over the document; the regex is cheaper for small files
+            for node in HTMLParser(html_data[:]).css('a'):
+                href = (node.attributes.get('href') or '').strip()
+                if href:
+                    yield [(node.text() or '').strip() or href, href]
+            return
         # Capture href and inner text of anchor tags
-        for href, text in re.findall(r'<a[^>]*href=\"([^\"]+)\"[^>]*>(.*?)</a>', html_text, flags=re.IGNORECASE|re.DOTALL):
+        for match in _NETSCAPE_ANCHOR_RE.finditer(html_data):
+            href = match.group(1).decode('utf-8', errors='ignore').strip()
             # Strip any nested HTML tags from title
-            clean_text = re.sub(r'<[^>]+>', '', text).strip()
-            results.append([clean_text or href, href.strip()])
-        return results
+            clean_text = _TAG_STRIP_RE.sub('', match.group(2).decode('utf-8', errors='ignore')).strip()
+            yield [clean_text or href, href]
 
-    def update_cookies_menu(self):
-        """Update the Cookies menu with a scrollable list of cookies."""
-        self.cookies_menu.clear()
-        try:
-            from PyQt6.QtWidgets import QListWidget, QWidgetAction, QListWidgetItem
-            # Build scrollable list
-            cookies_list = QListWidget()
-            cookies_list.setSelectionMode(QListWidget.SelectionMode.SingleSelection)
-            cookies_list.setMinimumWidth(420)
-            cookies_list.setMaximumHeight(300)
-            # Enable hover selection
-            try:
-                cookies_list.setMouseTracking(True)
-                def _cookies_item_entered(item):
-                    if item is not None:
-                        cookies_list.setCurrentItem(item)
-                cookies_list.itemEntered.connect(_cookies_item_entered)
-            except Exception:
-                pass
+    _COOKIES_MENU_LIMIT = 50
 
-            for cookie in self.cookies:
-                name = cookie.get('name', '')
-                domain = cookie.get('domain', '')
-                item_text = f"{name} — {domain}" if name or domain else "(cookie)"
-                item = QListWidgetItem(item_text)
-                cookies_list.addItem(item)
+    def _ensure_cookies_menu(self):
+        """Build the Cookies menu's list view and "Show All" entry once; later refreshes only reset the model."""
+        if self._cookies_view is not None:
+            return
+        from PyQt6.QtWidgets import QWidgetAction
+        # Drop any fallback actions left by an earlier failed build
+        self.cookies_menu.clear()
+        model = CookieListModel(self)
+        cookies_view = QListView()
+        cookies_view.setModel(model)
+        cookies_view.setSelectionMode(QListView.SelectionMode.SingleSelection)
+        cookies_view.setMinimumWidth(420)
+        cookies_view.setMaximumHeight(300)
+        _configure_menu_list_view(cookies_view)
+        # Enable hover selection
+        cookies_view.setMouseTracking(True)
+        cookies_view.entered.connect(cookies_view.setCurrentIndex)
+
+        list_action = QWidgetAction(self.cookies_menu)
+        list_action.setDefaultWidget(cookies_view)
+        self.cookies_menu.addAction(list_action)
+        self._cookies_separator = self.cookies_menu.addSeparator()
+        show_all_action = QAction(self)
+        show_all_action.triggered.connect(self.show_all_cookies_dialog)
+        self.cookies_menu.addAction(show_all_action)
+
+        self._cookies_show_all = show_all_action
+        self._cookies_model = model
+        self._cookies_view = cookies_view
 
-            list_action = QWidgetAction(self.cookies_menu)
-            list_action.setDefaultWidget(cookies_list)
-            self.cookies_menu.addAction(list_action)
+    def update_cookies_menu(self):
+        """Update the Cookies menu with a scrollable list of the most recent cookies."""
+        # Only the newest cookies are listed in the menu; the full list opens in a dialog
+        recent = list(itertools.islice(reversed(self.cookies), self._COOKIES_MENU_LIMIT))[::-1]
+        more = len(self.cookies) > len(recent)
+        try:
+            self._ensure_cookies_menu()
+            self._cookies_model.set_cookies(recent)
+            self._cookies_separator.setVisible(more)
+            self._cookies_show_all.setVisible(more)
+            self._cookies_show_all.setText(f"Show All Cookies ({len(self.cookies)})…")
         except Exception:
             # Fallback to simple actions
-            for cookie in self.cookies:
+            self.cookies_menu.clear()
+            self._cookies_view = None
+            for cookie in recent:
                 name = cookie.get('name', '')
                 domain = cookie.get('domain', '')
                 cookie_action = QAction(f"{name} - {domain}", self)
                 self.cookies_menu.addAction(cookie_action)
+            if more:
+                self.cookies_menu.addSeparator()
+                show_all_action = QAction(f"Show All Cookies ({len(self.cookies)})…", self)
+                show_all_action.triggered.connect(self.show_all_cookies_dialog)
+                self.cookies_menu.addAction(show_all_action)
+
+    def show_all_cookies_dialog(self):
+        """List every stored cookie in a dialog backed by CookieListModel (no per-row widgets)."""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Cookies")
+        dialog.resize(520, 420)
+        layout = QVBoxLayout(dialog)
+        view = QListView(dialog)
+        _configure_menu_list_view(view)
+        model = CookieListModel(view)
+        model.set_cookies(self.cookies)
+        view.setModel(model)
+        layout.addWidget(view)
+        close_button = QPushButton("Close", dialog)
+        close_button.clicked.connect(dialog.accept)
+        layout.addWidget(close_button)
+        dialog.exec()
 
     def update_url_autocomplete(self):
+        """Schedule a URL bar autocomplete rebuild; calls within 250 ms collapse into one."""
+        self._url_ac_timer.start(250)
+
+    def _do_update_url_autocomplete(self):
         """Build and apply URL bar autocomplete with icons from history and bookmarks."""
         try:
             from PyQt6.QtCore import Qt
@@ -5112,88 +5859,74 @@ class Browser(QMainWindow):
             return
 
         # Build label + maintain mapping to URL for icon loading
-        items: list[tuple[str, str]] = []  # (display_text, url)
-        added_urls: set[str] = set()
-
-        def add_entry(title: str, url: str, source: str):
-            if not url or url in added_urls:
-                return
-            base = f"{title} — {url}" if title else url
-            items.append((f"{base} ({source})", url))
-            added_urls.add(url)
-
-        # Bookmarks then history
-        for title, url in self.bookmarks:
-            add_entry(title, url, "Bookmarks")
-        for title, url in reversed(self.history[-500:]):
-            add_entry(title, url, "History")
-
-        # Create or update item model with icons
+        items: list[tuple[str, str, str]] = []  # (display_text, url, lowered filter text)
+        added_keys: set[str] = set()  # normalized, so http/https or '#frag' variants show once
+
+        # Bookmarks then history, one formatted label per entry
+        sources = ((self.bookmarks, " (Bookmarks)"), (itertools.islice(reversed(self.history), 500), " (History)"))
+        for entries, suffix in sources:
+            for title, url in entries:
+                if not url:
+                    continue
+                key = _completion_dedup_key(url)
+                if key in added_keys:
+                    continue
+                added_keys.add(key)
+                label = f"{title} — {url}{suffix}" if title else f"{url}{suffix}"
+                items.append((label, url, f"{title}\n{url}".lower() if title else url.lower()))
+
+        # The model is created once; favicons are cached per host across updates and only
+        # requested for rows the completer popup paints
         if not hasattr(self, '_url_item_model'):
-            self._url_item_model = QStandardItemModel(self)
-        else:
-            self._url_item_model.clear()
-
-        # Limit entries to avoid spawning too many network operations at once
-        for text, url in items[:600]:
-            it = QStandardItem(text)
-            it.setEditable(False)
-            # Load favicon asynchronously
-            def _apply(icon, item_ref=it):
-                try:
-                    if item_ref is not None:
-                        item_ref.setIcon(icon)
-                except Exception:
-                    pass
-            self._get_favicon_async(url, _apply)
-            self._url_item_model.appendRow(it)
+            self._url_item_model = UrlCompletionModel(self._get_favicon_async, self._favicon_key_for_url, self)
+        self._url_item_model.set_entries(items[:600])
 
         if not hasattr(self, '_url_completer'):
             extract = self._extract_url_from_completion_text
             class UrlOnlyCompleter(QCompleter):
                 def pathFromIndex(self_inner, index):
                     try:
-                        text = index.data()
+                        url = index.data(Qt.ItemDataRole.UserRole)
+                        if url:
+                            return url
+                        # Legacy path: models without a URL role carry it in the label
+                        return extract(str(index.data()))
                     except Exception:
                         return super().pathFromIndex(index)
-                    return extract(str(text))
 
-            self._url_completer = UrlOnlyCompleter(self._url_item_model, self)
-            self._url_completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
-            try:
-                self._url_completer.setFilterMode(Qt.MatchFlag.MatchContains)
-            except Exception:
-                pass
-            self._url_completer.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
+            # Filtering happens in this proxy on the model's pre-lowered title/url text (a
+            # case-sensitive native substring test); the completer just shows what passes
+            self._url_filter_proxy = QSortFilterProxyModel(self)
+            self._url_filter_proxy.setSourceModel(self._url_item_model)
+            self._url_filter_proxy.setFilterRole(_COMPLETION_FILTER_ROLE)
+            self._url_filter_proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseSensitive)
+            self.url_bar.textEdited.connect(self._on_url_bar_edited)
+
+            self._url_completer = UrlOnlyCompleter(self._url_filter_proxy, self)
+            self._url_completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
             self._url_completer.activated[str].connect(self._on_url_completion_activated)
             self.url_bar.setCompleter(self._url_completer)
-        else:
-            self._url_completer.setModel(self._url_item_model)
+
+    def _on_url_bar_edited(self, text: str):
+        """Narrow the completer rows; QLineEdit refreshes the popup right after textEdited."""
+        self._url_filter_proxy.setFilterFixedString(text.lower())
 
     def _on_url_completion_activated(self, text: str):
-        """When a completion is chosen, extract URL and navigate."""
-        url = self._extract_url_from_completion_text(text)
-        self.url_bar.setText(url)
+        """When a completion is chosen, navigate to it (text is already the URL from pathFromIndex)."""
+        self.url_bar.setText(text)
         self.navigate_to_url()
 
     def _extract_url_from_completion_text(self, text: str) -> str:
         """Extract the pure URL from an autocomplete display string."""
         url = text or ""
         # Prefer splitting on the em dash we use for display
-        if ' — ' in url:
-            parts = url.rsplit(' — ', 1)
-            if len(parts) == 2:
-                url = parts[1]
-        elif ' - ' in url:
-            parts = url.rsplit(' - ', 1)
-            if len(parts) == 2:
-                url = parts[1]
+        _, sep, tail = url.rpartition(' — ')
+        if not sep:
+            _, sep, tail = url.rpartition(' - ')
+        if sep:
+            url = tail
         # Strip label suffixes like " (Bookmarks)" or " (History)"
-        for suffix in (" (Bookmarks)", " (History)"):
-            if url.endswith(suffix):
-                url = url[: -len(suffix)]
-                break
-        return url.strip()
+        return url.removesuffix(" (Bookmarks)").removesuffix(" (History)").strip()
 
     def add_cookie(self, cookie):
         """ Add a cookie to the list and save it """
@@ -5206,21 +5939,28 @@ class Browser(QMainWindow):
         }
 
         # Check if the cookie already exists
-        for existing_cookie in self.cookies:
-            if (existing_cookie['name'] == cookie_dict['name'] and
-                    existing_cookie['domain'] == cookie_dict['domain'] and
-                    existing_cookie['path'] == cookie_dict['path']):
-                # Update the existing cookie value and expiry
-                existing_cookie['value'] = cookie_dict['value']
-                existing_cookie['expiry'] = cookie_dict['expiry']
-                break
+        key = _COOKIE_KEY(cookie_dict)
+        existing_cookie = self._cookies_by_key.get(key)
+        if existing_cookie is not None:
+            # Update the existing cookie value and expiry
+            existing_cookie['value'] = cookie_dict['value']
+            existing_cookie['expiry'] = cookie_dict['expiry']
         else:
             # If the cookie does not exist, add it to the list
+            if len(self.cookies) == self.cookies.maxlen:
+                # The append below evicts the oldest cookie; drop it from the index too
+                evicted = self.cookies[0]
+                try:
+                    if self._cookies_by_key.get(_COOKIE_KEY(evicted)) is evicted:
+                        del self._cookies_by_key[_COOKIE_KEY(evicted)]
+                except (KeyError, TypeError):
+                    pass
             self.cookies.append(cookie_dict)
-            self.cookies = self.cookies[-500:]  # Keep last 500
+            self._cookies_by_key[key] = cookie_dict
 
-        self.save_json(self.cookies_file, self.cookies)
-        self.update_cookies_menu()
+        # The Cookies menu refreshes itself on aboutToShow, so bursts of cookieAdded
+        # (500 restored cookies at startup, dozens per page load) cost no menu work
+        self._mark_json_dirty('cookies')
         
     def load_cookies_to_web_engine(self):
         """ Load cookies into the web engine """
@@ -5234,14 +5974,20 @@ class Browser(QMainWindow):
                 return
             profile = page.profile()
             cookie_store = profile.cookieStore()
+            # No blockSignals here: cookieAdded arrives asynchronously after this loop, and each
+            # add_cookie it triggers is only an index lookup plus a batched save (no menu rebuild)
             for cookie in self.cookies:
-                qcookie = QNetworkCookie(
-                    cookie['name'].encode('utf-8'),
-                    cookie['value'].encode('utf-8')
-                )
-                qcookie.setDomain(cookie['domain'])
-                qcookie.setPath(cookie['path'])
-                qcookie.setExpirationDate(QDateTime.fromString(cookie['expiry'], Qt.DateFormat.ISODate))
+                try:
+                    name, value, domain, path, expiry = _COOKIE_FIELDS(cookie)
+                except (KeyError, TypeError):
+                    get = getattr(cookie, 'get', None)
+                    if get is None:
+                        continue
+                    name, value, domain, path, expiry = get('name', ''), get('value', ''), get('domain', ''), get('path', '/'), get('expiry', '')
+                qcookie = QNetworkCookie(name.encode('utf-8'), value.encode('utf-8'))
+                qcookie.setDomain(domain)
+                qcookie.setPath(path)
+                qcookie.setExpirationDate(_cookie_expiry(expiry))
                 cookie_store.setCookie(qcookie)
         except Exception as e:
             # Silently handle any errors during cookie loading
@@ -5259,42 +6005,58 @@ class Browser(QMainWindow):
         self.settings_manager.save_settings()
 
     def add_bookmark(self, title, url, bookmarks_list):
-        if title and url:
-            self.bookmarks.append([title, url])
-            self.bookmarks = self.bookmarks[-500:]  # Keep last 500
-            self.save_json(self.bookmarks_file, self.bookmarks)
-            bookmarks_list.addItem(f"{title} - {url}")
+        if title and url and self._bookmark_add(title, url):
+            if len(self.bookmarks) > 500:
+                self.bookmarks = self.bookmarks[-500:]  # Keep last 500
+                self._sync_bookmark_urls()
+            self._mark_json_dirty('bookmarks')
+            item = QListWidgetItem(f"{title} - {url}")
+            item.setData(Qt.ItemDataRole.UserRole, url)
+            bookmarks_list.addItem(item)
             self._populate_bookmarks_menu()
 
     def remove_selected_bookmark(self, bookmarks_list):
         selected_items = bookmarks_list.selectedItems()
         if not selected_items:
             return
-        for item in selected_items:
-            item_text = item.text()
-            title, url = item_text.split(" - ", 1)
-            self.bookmarks = [bookmark for bookmark in self.bookmarks if bookmark[1] != url]
-            bookmarks_list.takeItem(bookmarks_list.row(item))
+        urls_to_remove = {_list_item_url(item) for item in selected_items}
+        # One filter pass for the whole selection
+        self.bookmarks = [bookmark for bookmark in self.bookmarks if bookmark[1] not in urls_to_remove]
+        self._bookmark_urls -= urls_to_remove
+        # Highest rows first so earlier rows keep their positions
+        for row in sorted((bookmarks_list.row(item) for item in selected_items), reverse=True):
+            bookmarks_list.takeItem(row)
         self.save_json(self.bookmarks_file, self.bookmarks)
         self._populate_bookmarks_menu()
 
     def update_history_on_uncheck(self, item, history_list):
         if item.checkState() == Qt.CheckState.Unchecked:
-            item_text = item.text()
-            title, url = item_text.split(" - ", 1)
-            self.history = [entry for entry in self.history if entry[1] != url]
+            url = _list_item_url(item)
             history_list.takeItem(history_list.row(item))
-            self.save_json(self.history_file, self.history)
-            self.update_history_menu()
+            # Several unchecks in one event-loop pass share a single filter, save and menu refresh
+            if not self._history_removals:
+                QTimer.singleShot(0, self._flush_history_removals)
+            self._history_removals.add(url)
+
+    def _flush_history_removals(self):
+        urls, self._history_removals = self._history_removals, set()
+        if not urls:
+            return
+        kept = [entry for entry in self.history if entry[1] not in urls]
+        self.history.clear()
+        self.history.extend(kept)
+        self.save_json(self.history_file, self.history)
+        self.update_history_menu()
 
     def clear_all_history(self):
-        self.history = []
+        self.history.clear()
         self.save_json(self.history_file, self.history)
         self.update_history_menu()
         
     def remove_all_cookies(self):
-        self.cookies = []
-        self.save_json(self.cookies_file, self.cookies)
+        self.cookies.clear()
+        self._cookies_by_key.clear()
+        self._mark_json_dirty('cookies')
         
         # Clear cookies from web engine
         view = self._current_web_view()
@@ -5357,6 +6119,11 @@ class Browser(QMainWindow):
             elif font_color.startswith('#'):
                 style += f" color: {font_color};"
         
+        # setStyleSheet re-polishes every child widget, even for an identical or empty sheet
+        if style == getattr(self, '_last_style', None) or (not style and not self.styleSheet()):
+            self._last_style = style
+            return
+        self._last_style = style
         self.setStyleSheet(style)
         
     def reset_background_color(self):
@@ -5416,25 +6183,14 @@ class Browser(QMainWindow):
         self.settings_manager.save_settings()
             
     def save_settings(self):
-        # Update settings manager with current values
-        self.settings_manager.set('homepage', self.homepage_url)
-        self.settings_manager.set('background_color', self.background_color.name())
-        self.settings_manager.set('font_color', self.font_color.name())
-        self.settings_manager.set('font_family', QApplication.instance().font().toString())
-        self.settings_manager.save_settings()
-        
-        # Legacy format for backward compatibility
-        settings = {
-            'homepage': self.homepage_url,
-            'background_color': self.background_color.name(),
-            'font_color': self.font_color.name(),
-            'font': QApplication.instance().font().toString()
-        }
-        try:
-            with open(os.path.join(self.data_dir, 'settings.json'), 'w') as f:
-                json.dump(settings, f, indent=4)
-        except Exception as e:
-            print(f"Failed to save legacy settings: {e}")
+        # Update settings manager with current values. It owns data_dir/settings.json, the
+        # same path the old flat format used, so there is no separate legacy file to write.
+        sm = self.settings_manager
+        sm.set('homepage', self.homepage_url)
+        sm.set('background_color', self.background_color.name())
+        sm.set('font_color', self.font_color.name())
+        sm.set('font_family', QApplication.instance().font().toString())
+        sm.save_settings()
             
     def load_settings(self):
         # Try new settings format first
@@ -5462,12 +6218,13 @@ class Browser(QMainWindow):
     
     def _apply_settings_to_browser(self):
         """Apply settings from settings manager to browser components"""
+        get = self.settings_manager.get
         # Update homepage
-        self.homepage_url = self.settings_manager.get('homepage')
+        self.homepage_url = get('homepage')
         
         # Update colors and theme
-        bg_color = self.settings_manager.get('background_color', 'system')
-        font_color = self.settings_manager.get('font_color', '#000000')
+        bg_color = get('background_color', 'system')
+        font_color = get('font_color', '#000000')
         
         if bg_color != 'system':
             self.background_color = QColor(bg_color)
@@ -5481,14 +6238,14 @@ class Browser(QMainWindow):
         self.apply_styles()
         
         # Update font
-        font_size = self.settings_manager.get('font_size', 12)
-        font_family = self.settings_manager.get('font_family', 'system')
+        font_size = get('font_size', 12)
+        font_family = get('font_family', 'system')
         if font_family != 'system':
             font = QFont(font_family, font_size)
             QApplication.instance().setFont(font)
         
         # Update UI scale
-        ui_scale = self.settings_manager.get('ui_scale', 1.0)
+        ui_scale = get('ui_scale', 1.0)
         if ui_scale != 1.0:
             # Apply UI scaling (requires restart for full effect)
             pass
@@ -5497,23 +6254,25 @@ class Browser(QMainWindow):
         self._apply_proxy_settings()
         
         # Update toolbar visibility
-        show_toolbar = self.settings_manager.get('show_toolbar', True)
+        show_toolbar = get('show_toolbar', True)
         for toolbar in self.findChildren(QToolBar):
             toolbar.setVisible(show_toolbar)
         if hasattr(self, 'status_bar'):
-            self.status_bar.setVisible(self.settings_manager.get('show_status_bar', True))
+            self.status_bar.setVisible(get('show_status_bar', True))
         
         # Apply web engine settings to all tabs
-        self._apply_web_engine_settings()
+        changed_tabs = self._apply_web_engine_settings()
         
-        # Refresh all tabs to apply changes
-        self._refresh_all_tabs()
+        # Reload only the tabs whose web attributes changed; font/colour/toolbar
+        # changes above don't need the pages refetched
+        if changed_tabs:
+            self._refresh_all_tabs(changed_tabs)
     
-    def _refresh_all_tabs(self):
-        """Refresh all tabs to apply new settings"""
-        current_index = self.tabs.currentIndex()
-        for i in range(self.tabs.count()):
-            tab = self.tabs.widget(i)
+    def _refresh_all_tabs(self, tabs=None):
+        """Refresh tabs (all of them by default) to apply new settings"""
+        if tabs is None:
+            tabs = [self.tabs.widget(i) for i in range(self.tabs.count())]
+        for tab in tabs:
             if isinstance(tab, CustomWebEngineView):
                 # Only reload if tab has content
                 if tab.url().toString() and tab.url().toString() != 'about:blank':
@@ -5552,6 +6311,19 @@ class Browser(QMainWindow):
         # Custom user agent for better compatibility
         profile.setHttpUserAgent("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Surfscape/1.0")
     
+    def _install_perf_probe(self, profile):
+        """Register the page timing probe on profile so its source is injected by the engine, not per load."""
+        try:
+            script = QWebEngineScript()
+            script.setName("surfscape-perf-probe")
+            script.setSourceCode(_PAGE_PERF_JS)
+            script.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentReady)
+            script.setWorldId(QWebEngineScript.ScriptWorldId.ApplicationWorld)
+            script.setRunsOnSubFrames(False)
+            profile.scripts().insert(script)
+        except Exception as e:
+            print(f"Perf probe unavailable: {e}")
+
     def _on_tab_load_started(self, browser):
         """Handle tab loading start with performance optimizations"""
         self.tab_loading_pool.add(browser)
@@ -5561,7 +6333,14 @@ class Browser(QMainWindow):
             if self.ad_blocker_rules and getattr(self.ad_blocker_rules, 'prefetch_domain', None):
                 qurl = browser.url() if hasattr(browser, 'url') else None
                 host = qurl.host() if qurl else ''
-                if host:
+                prefetched = self._prefetched_hosts
+                if host in prefetched:
+                    # Reloads/SPA navigations on a recent host: subset already built or queued
+                    prefetched.move_to_end(host)
+                elif host:
+                    prefetched[host] = None
+                    if len(prefetched) > 256:
+                        prefetched.popitem(last=False)
                     self.ad_blocker_rules.prefetch_domain(host)
         except Exception:
             pass
@@ -5620,63 +6399,11 @@ class Browser(QMainWindow):
         
         # Re-enable dev tools updates if no tabs are loading
         # Lightweight performance markers (optional) - collect and print key paint metrics
-        if getattr(self, 'perf_trace', False):
-                try:
-                        if browser and hasattr(browser, 'page'):
-                                page = browser.page()
-                                js = """
-                                        (function(){
-                                            if(!window.performance){return null;}
-                                            let nav = (performance.getEntriesByType && performance.getEntriesByType('navigation')) ? performance.getEntriesByType('navigation')[0] : null;
-                                            let paint = (performance.getEntriesByType && performance.getEntriesByType('paint')) ? performance.getEntriesByType('paint') : [];
-                                            let fp = null; let fcp = null;
-                                            for (const p of paint){ if(p.name==='first-paint') fp = p.startTime; if(p.name==='first-contentful-paint') fcp = p.startTime; }
-                                            const t = performance.timing || {};
-                                            function clamp(v){return (typeof v==='number' && v>=0 && v<1e8)? v : null;}
-                                            let metrics = {};
-                                            if(nav){
-                                                metrics = {
-                                                    dns: clamp(nav.domainLookupEnd - nav.domainLookupStart),
-                                                    connect: clamp(nav.connectEnd - nav.connectStart),
-                                                    ttfb: clamp(nav.responseStart - nav.startTime),
-                                                    response: clamp(nav.responseEnd - nav.responseStart),
-                                                    domContentLoaded: clamp(nav.domContentLoadedEventEnd - nav.startTime),
-                                                    firstPaint: clamp(fp),
-                                                    firstContentfulPaint: clamp(fcp),
-                                                    load: clamp(nav.loadEventEnd - nav.startTime)
-                                                };
-                                            } else if(t.navigationStart){
-                                                const ns = t.navigationStart;
-                                                metrics = {
-                                                    dns: clamp(t.domainLookupEnd - t.domainLookupStart),
-                                                    connect: clamp(t.connectEnd - t.connectStart),
-                                                    ttfb: clamp(t.responseStart - ns),
-                                                    response: clamp(t.responseEnd - t.responseStart),
-                                                    domContentLoaded: clamp(t.domContentLoadedEventEnd - ns),
-                                                    firstPaint: clamp(fp),
-                                                    firstContentfulPaint: clamp(fcp),
-                                                    load: clamp(t.loadEventEnd - ns)
-                                                };
-                                            }
-                                            // Gather top slow resources (exclude data: and chrome-extension:)
-                                            let slow = [];
-                                            if (performance.getEntriesByType){
-                                                const resources = performance.getEntriesByType('resource') || [];
-                                                for (const r of resources){
-                                                    if((r.initiatorType==='img'||r.initiatorType==='script'||r.initiatorType==='css'||r.initiatorType==='fetch'||r.initiatorType==='xmlhttprequest') && r.duration>500){
-                                                            if(r.name.startsWith('data:')||r.name.startsWith('chrome-extension')) continue;
-                                                            slow.push({name:r.name.slice(0,140), type:r.initiatorType, dur: Math.round(r.duration)});
-                                                    }
-                                                }
-                                                slow.sort((a,b)=>b.dur - a.dur);
-                                                metrics.slow = slow.slice(0,5);
-                                            }
-                                            return metrics;
-                                        })();
-                                """
-                                page.runJavaScript(js,  lambda m: self._log_perf_metrics(m))
-                except Exception:
-                        pass
+        if getattr(self, 'perf_trace', False) and page is not None:
+            try:
+                page.runJavaScript(_PAGE_PERF_CALL, QWebEngineScript.ScriptWorldId.ApplicationWorld.value, self._log_perf_metrics)
+            except Exception:
+                pass
         if browser is self._current_web_view():
             self._set_status_progress(None, browser)
             if success:
@@ -5686,20 +6413,11 @@ class Browser(QMainWindow):
             self._update_status_from_view(browser)
 
     def _log_perf_metrics(self, metrics):
+        """runJavaScript callback: hand the plain metrics dict to the IO pool for formatting/printing."""
+        if not metrics or not isinstance(metrics, dict):
+            return
         try:
-            if not metrics:
-                return
-            slow_str = ''
-            slow = metrics.get('slow') or []
-            if slow:
-                parts = [f"{s['type']}:{s['dur']}ms" for s in slow]
-                slow_str = ' slow=[' + ', '.join(parts) + ']'
-            print(
-                "PagePerf "
-                f"dns={metrics.get('dns')}ms connect={metrics.get('connect')}ms ttfb={metrics.get('ttfb')}ms "
-                f"resp={metrics.get('response')}ms dcl={metrics.get('domContentLoaded')}ms fp={metrics.get('firstPaint')}ms "
-                f"fcp={metrics.get('firstContentfulPaint')}ms load={metrics.get('load')}ms" + slow_str
-            )
+            self.io_pool.submit(_print_perf_metrics, metrics)
         except Exception:
             pass
     
@@ -5710,7 +6428,7 @@ class Browser(QMainWindow):
             view.reload()
     
     def _apply_web_engine_settings(self):
-        """Apply privacy and security settings to web engine"""
+        """Apply privacy and security settings to web engine; returns the tabs whose attributes changed"""
         # Apply settings to all existing tabs and default profile
         enable_js = self.settings_manager.get('enable_javascript', True)
         enable_plugins = self.settings_manager.get('enable_plugins', True)
@@ -5720,94 +6438,129 @@ class Browser(QMainWindow):
         block_popups = self.settings_manager.get('block_popups', True)
         enable_hw_accel = self.settings_manager.get('enable_hardware_acceleration', True)
         
+        WebAttribute = QWebEngineSettings.WebAttribute
+        attrs = (
+            (WebAttribute.JavascriptEnabled, enable_js),
+            (WebAttribute.PluginsEnabled, enable_plugins),
+            (WebAttribute.AutoLoadImages, enable_images),
+            (WebAttribute.WebGLEnabled, enable_webgl),
+            (WebAttribute.PlaybackRequiresUserGesture, not enable_autoplay),
+            # Allow window.open; pop-up blocking handled in new window handler
+            (WebAttribute.JavascriptCanOpenWindows, True),
+            (WebAttribute.Accelerated2dCanvasEnabled, enable_hw_accel),
+        )
+
         # Apply to default profile settings
         default_profile = QWebEngineProfile.defaultProfile()
         default_settings = default_profile.settings()
         
+        previous_default = getattr(self, '_default_web_attrs', None)
         if default_settings:
-            default_settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptEnabled, enable_js)
-            default_settings.setAttribute(QWebEngineSettings.WebAttribute.PluginsEnabled, enable_plugins)
-            default_settings.setAttribute(QWebEngineSettings.WebAttribute.AutoLoadImages, enable_images)
-            default_settings.setAttribute(QWebEngineSettings.WebAttribute.WebGLEnabled, enable_webgl)
-            default_settings.setAttribute(QWebEngineSettings.WebAttribute.PlaybackRequiresUserGesture, not enable_autoplay)
-            # Allow window.open; pop-up blocking handled in new window handler
-            default_settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptCanOpenWindows, True)
-            default_settings.setAttribute(QWebEngineSettings.WebAttribute.Accelerated2dCanvasEnabled, enable_hw_accel)
-        
-        # Apply to all existing tabs
+            _set_web_attributes(default_settings, attrs, previous_default)
+            self._default_web_attrs = attrs
+        
+        # Apply to all existing tabs; each remembers what it last received so unchanged
+        # attributes (or whole tabs) cost no Qt calls. Tabs never touched here get every
+        # attribute (private tabs use their own profile, not the default one); for the reload
+        # decision they count as holding the previous defaults. The first (startup) apply
+        # reports no changes: those tabs have only just loaded.
+        changed_tabs = []
         for i in range(self.tabs.count()):
             tab = self.tabs.widget(i)
             if isinstance(tab, CustomWebEngineView):
                 page_settings = tab.page().settings()
                 if page_settings:
-                    page_settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptEnabled, enable_js)
-                    page_settings.setAttribute(QWebEngineSettings.WebAttribute.PluginsEnabled, enable_plugins)
-                    page_settings.setAttribute(QWebEngineSettings.WebAttribute.AutoLoadImages, enable_images)
-                    page_settings.setAttribute(QWebEngineSettings.WebAttribute.WebGLEnabled, enable_webgl)
-                    page_settings.setAttribute(QWebEngineSettings.WebAttribute.PlaybackRequiresUserGesture, not enable_autoplay)
-                    page_settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptCanOpenWindows, True)
-                    page_settings.setAttribute(QWebEngineSettings.WebAttribute.Accelerated2dCanvasEnabled, enable_hw_accel)
+                    applied = getattr(tab, '_applied_web_attrs', None)
+                    baseline = previous_default if applied is None else applied
+                    if baseline is not None and baseline != attrs:
+                        changed_tabs.append(tab)
+                    _set_web_attributes(page_settings, attrs, applied)
+                    tab._applied_web_attrs = attrs
         
         # Apply custom CSS/JS if provided
         self._apply_custom_styles_and_scripts()
+        return changed_tabs
     
+    def _custom_code_scripts(self) -> tuple[str, ...]:
+        """Scripts applying the custom CSS and JS settings (empty ones left out); rebuilt only when either changes."""
+        get = self.settings_manager.get
+        key = (get('custom_css', ''), get('custom_js', ''))
+        cached = getattr(self, '_custom_script_cache', None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        custom_css, custom_js = key
+        scripts = []
+        if custom_css:
+            # Escaped once here so the CSS can't end the template literal or interpolate
+            escaped_css = custom_css.replace('\\', '\\\\').replace('`', '\\`').replace('${', '\\${')
+            scripts.append(f"""
+                    (function() {{
+                        var style = document.createElement('style');
+                        style.type = 'text/css';
+                        style.innerHTML = `{escaped_css}`;
+                        document.getElementsByTagName('head')[0].appendChild(style);
+                    }})();
+                    """)
+        if custom_js:
+            # Separate runJavaScript call: a syntax error in the user's JS must not stop
+            # the CSS from applying, and no eval means page CSPs can't block it
+            scripts.append(custom_js)
+        scripts = tuple(scripts)
+        self._custom_script_cache = (key, scripts)
+        return scripts
+
     def _apply_custom_styles_and_scripts(self):
         """Apply custom CSS and JavaScript to web pages"""
-        custom_css = self.settings_manager.get('custom_css', '')
-        custom_js = self.settings_manager.get('custom_js', '')
+        scripts = self._custom_code_scripts()
+        # Open tabs already received this exact CSS/JS (new tabs inject it on load), and
+        # re-running it would stack duplicate <style> elements
+        if scripts == getattr(self, '_applied_custom_scripts', None):
+            return
+        self._applied_custom_scripts = scripts
+        if not scripts:
+            return
         
         # Apply to all existing tabs
         for i in range(self.tabs.count()):
             tab = self.tabs.widget(i)
             if isinstance(tab, CustomWebEngineView):
-                if custom_css:
-                    css_script = f"""
-                    (function() {{
-                        var style = document.createElement('style');
-                        style.type = 'text/css';
-                        style.innerHTML = `{custom_css}`;
-                        document.getElementsByTagName('head')[0].appendChild(style);
-                    }})();
-                    """
-                    tab.page().runJavaScript(css_script)
-                
-                if custom_js:
-                    tab.page().runJavaScript(custom_js)
+                page = tab.page()
+                for script in scripts:
+                    page.runJavaScript(script)
     
+    def _inject_custom_code(self, ok: bool):
+        """loadFinished slot: run the cached custom CSS/JS in the tab that finished loading."""
+        tab = self.sender()
+        if not isinstance(tab, CustomWebEngineView):
+            return
+        scripts = self._custom_code_scripts()
+        if scripts:
+            page = tab.page()
+            for script in scripts:
+                page.runJavaScript(script)
+
     def apply_settings_to_new_tab(self, tab):
         """Apply current settings to a newly created tab"""
         if isinstance(tab, CustomWebEngineView):
-            # Apply custom CSS/JS to new tab after page loads
-            custom_css = self.settings_manager.get('custom_css', '')
-            custom_js = self.settings_manager.get('custom_js', '')
-            
-            def inject_custom_code():
-                if custom_css:
-                    css_script = f"""
-                    (function() {{
-                        var style = document.createElement('style');
-                        style.type = 'text/css';
-                        style.innerHTML = `{custom_css}`;
-                        document.getElementsByTagName('head')[0].appendChild(style);
-                    }})();
-                    """
-                    tab.page().runJavaScript(css_script)
-                
-                if custom_js:
-                    tab.page().runJavaScript(custom_js)
-            
-            # Connect to page load finished to inject code
-            tab.loadFinished.connect(lambda: inject_custom_code())
+            # Apply custom CSS/JS to new tab after page loads (one bound slot shared by all tabs)
+            tab.loadFinished.connect(self._inject_custom_code)
         
         # Apply AI assistant settings
-        if hasattr(self, 'ai_widget'):
+        if self.ai_widget is not None:
             ai_enabled = self.settings_manager.get('ai_enabled', True)
             if not ai_enabled and self.ai_widget.isVisible():
                 self.ai_widget.hide()
     
     def _apply_proxy_settings(self):
         """Apply proxy settings based on current configuration"""
-        proxy_type = self.settings_manager.get('proxy_type', 'none')
+        get = self.settings_manager.get
+        proxy_type = get('proxy_type', 'none')
+        proxy_key = (proxy_type, get('proxy_host', '127.0.0.1'), get('proxy_port', 8080), get('proxy_username', ''), get('proxy_password', ''))
+        # Unchanged since the last apply: skip re-setting the application proxy (and the
+        # settings save the tor/i2p/none helpers do)
+        if proxy_key == getattr(self, '_last_applied_proxy_key', None):
+            return
+        self._last_applied_proxy_key = proxy_key
         
         if proxy_type == 'none':
             self.disable_tor_proxy()
@@ -5896,7 +6649,7 @@ class Browser(QMainWindow):
         dm.activateWindow()
     
     def show_find_dialog(self):
-        self.find_dialog.show_and_focus()
+        self._ensure_find_dialog().show_and_focus()
     
     def zoom_in(self):
         view = self._current_web_view()
@@ -5941,25 +6694,120 @@ class Browser(QMainWindow):
                 if page is not None:
                     page.printToPdf(printer.outputFileName() or "page.pdf")
     
-    def save_session(self):
-        session_data = []
-        for i in range(self.tabs.count()):
-            tab = self.tabs.widget(i)
-            if tab and hasattr(tab, 'url'):
-                session_data.append({
-                    'url': tab.url().toString(),
-                    'title': self.tabs.tabText(i)
-                })
+    def _session_tab_id(self, tab) -> int:
+        session_id = getattr(tab, '_session_id', None)
+        if session_id is None:
+            session_id = tab._session_id = next(self._session_ids)
+        return session_id
+
+    def _append_session_record(self, record: dict):
+        """Queue one upsert/close op for the session log; rewrites it once it outgrows the compaction limit."""
+        if not self.settings_manager.get('restore_session', True):
+            return
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+        self._session_log_size += len(line)
+        try:
+            self._session_io.submit(self._session_write_line, line)
+        except RuntimeError:
+            return  # writer already shut down by closeEvent
+        if self._session_log_size > _SESSION_LOG_COMPACT_BYTES:
+            self.save_session()
 
-        self.save_json(self.session_file, session_data)
+    def _log_session_tab(self, tab):
+        """Record a tab's current URL and title (private tabs are never written)."""
+        if getattr(tab, 'private_mode', False):
+            return
+        url = tab._last_url_str
+        if not url:
+            return
+        page = tab.page()
+        title = page.title() if page is not None else ""
+        self._append_session_record({"op": "upsert", "id": self._session_tab_id(tab), "url": url, "title": title})
 
+    # Session log file access runs only on the single _session_io thread, in submission order
 
-    def restore_session(self):
-        if not os.path.exists(self.session_file):
-            self.add_new_tab(QUrl(self.homepage_url), 'Homepage')
-            return
+    def _session_write_line(self, line: str):
+        try:
+            log = self._session_log
+            if log is None:
+                # Append once restore has rewritten the log as a snapshot; without a restore the
+                # first write of a run starts a fresh log
+                mode = 'a' if self._session_log_current else 'w'
+                log = self._session_log = open(self.session_log_file, mode, encoding='utf-8', buffering=1)
+                self._session_log_current = True
+            log.write(line)
+        except Exception as e:
+            print(f"Failed to write session log: {e}")
+
+    def _close_session_log(self):
+        log, self._session_log = self._session_log, None
+        if log is not None:
+            try:
+                log.close()
+            except Exception:
+                pass
 
-        session_data = self.load_json(self.session_file)
+    def _session_write_snapshot(self, lines: list[str]):
+        self._close_session_log()
+        # QSaveFile writes a temporary file and renames it over the log on commit()
+        save_file = QSaveFile(self.session_log_file)
+        try:
+            if not save_file.open(QIODevice.OpenModeFlag.WriteOnly):
+                raise OSError(save_file.errorString())
+            save_file.write(''.join(lines).encode('utf-8'))
+            if not save_file.commit():
+                raise OSError(save_file.errorString())
+            self._session_log_current = True
+        except Exception as e:
+            save_file.cancelWriting()
+            print(f"Failed to save session: {e}")
+
+    def save_session(self):
+        """Rewrite the session log as one upsert per open (non-private) tab, in tab order."""
+        # Tab state is read here on the GUI thread; only the file write is queued
+        tabs = self.tabs
+        dumps = functools.partial(json.dumps, ensure_ascii=False, separators=(',', ':'))
+        lines = [
+            dumps({"op": "upsert", "id": self._session_tab_id(tab), "url": tab._last_url_str, "title": tabs.tabText(i)}) + '\n'
+            for i in range(tabs.count())
+            for tab in (tabs.widget(i),)
+            if isinstance(tab, CustomWebEngineView) and not tab.private_mode
+        ]
+
+        self._session_log_size = sum(map(len, lines))
+        try:
+            self._session_io.submit(self._session_write_snapshot, lines)
+        except RuntimeError:
+            pass  # writer already shut down by closeEvent
+
+    def _read_session_log(self) -> list[dict]:
+        """Replay the session log into the surviving tabs, in the order they were first seen."""
+        tabs: dict = {}
+        with open(self.session_log_file, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn last line after a crash
+                if not isinstance(record, dict):
+                    continue
+                op = record.get('op')
+                if op == 'upsert':
+                    tabs[record.get('id')] = record
+                elif op == 'close':
+                    tabs.pop(record.get('id'), None)
+        return list(tabs.values())
+
+    def restore_session(self):
+        session_data = None
+        if os.path.exists(self.session_log_file):
+            try:
+                session_data = self._read_session_log()
+            except Exception as e:
+                print(f"Failed to read session log: {e}")
+        elif os.path.exists(self.session_file):
+            # Pre-log sessions were a single JSON snapshot
+            session_data = self.load_json(self.session_file)
         if not session_data:
             self.add_new_tab(QUrl(self.homepage_url), 'Homepage')
         else:
@@ -5967,7 +6815,16 @@ class Browser(QMainWindow):
                 url = tab_data.get('url')
                 title = tab_data.get('title', 'Tab')
                 if url:
-                    self.add_new_tab(QUrl(url), title)
+                    # Logged URLs are already encoded, so take the strict parser; older
+                    # display-form entries fall back to tolerant parsing
+                    qurl = QUrl.fromEncoded(url.encode('utf-8'), QUrl.ParsingMode.StrictMode)
+                    tab = self.add_new_tab(qurl if qurl.isValid() else QUrl(url), title)
+                    if not tab._last_url_str:
+                        # Until its first urlChanged the tab is still known by its logged URL
+                        tab._last_url_str = url
+        # The restored tabs become the new log at once, so a tab whose page is slow to load
+        # (or never loads) is not lost if the browser dies before it reports its URL
+        self.save_session()
 
 
     def closeEvent(self, event):
@@ -5987,19 +6844,36 @@ class Browser(QMainWindow):
         if self.settings_manager.get('clear_data_on_exit', False):
             self.clear_all_history()
             self.remove_all_cookies()
+
+        # Write any batched bookmark/history/cookie changes before the pools shut down
+        self._flush_json_saves()
         
         # Save session if enabled
         if self.settings_manager.get('restore_session', True):
             self.save_session()
+        # Let queued session writes finish (no-op wait when nothing is pending)
+        try:
+            self._session_io.submit(self._close_session_log)
+        except RuntimeError:
+            pass  # writer already shut down by an earlier closeEvent
+        self._session_io.shutdown(wait=True)
         
-        # Close background worker pools
+        # Close worker pools owned by this window; the shared pool serves every window
+        # and is shut down once in __main__ after the event loop exits
         pool = getattr(self, 'background_pool', None)
-        if pool is not None:
+        if pool is not None and pool is not _SHARED_IO_POOL:
             pool.shutdown(wait=True)
         io_pool = getattr(self, 'io_pool', None)
-        if io_pool is not None and io_pool is not pool:
+        if io_pool is not None and io_pool is not pool and io_pool is not _SHARED_IO_POOL:
             io_pool.shutdown(wait=True)
 
+        if self._favicon_db is not None:
+            try:
+                self._favicon_db.close()
+            except Exception:
+                pass
+            self._favicon_db = None
+
         super().closeEvent(event)
 
     def _init_adblock_legacy(self):
@@ -6008,7 +6882,11 @@ class Browser(QMainWindow):
             # Pass shared thread pool and cache path so subset compilation can reuse cached list
             cache_path = os.path.join(self.data_dir, 'adblock_lists.cache')
             worker = AdBlockerWorker(pool=self.background_pool, cache_path=cache_path)
-            await worker.download_adblock_lists()
+            try:
+                await worker.download_adblock_lists()
+            finally:
+                # The session is bound to this short-lived loop; release its connections with it
+                await worker.close()
             # In incremental mode worker.rules may be None intentionally
             if not worker.incremental_enabled and not worker.rules:
                 worker._ensure_full_rules_async()
@@ -6018,10 +6896,10 @@ class Browser(QMainWindow):
             self.ad_blocker_rules = engine
             if hasattr(self, 'network_interceptor'):
                 self.network_interceptor.ad_blocker_rules = engine
-                self.network_interceptor.domain_block_set = set(getattr(engine, 'domain_block_set', set()))
+                self.network_interceptor.domain_block_set = getattr(engine, 'domain_block_set', frozenset())
             if hasattr(self, 'private_network_interceptor'):
                 self.private_network_interceptor.ad_blocker_rules = engine
-                self.private_network_interceptor.domain_block_set = set(getattr(engine, 'domain_block_set', set()))
+                self.private_network_interceptor.domain_block_set = getattr(engine, 'domain_block_set', frozenset())
             total_rules = len(worker._all_rule_lines) if getattr(worker, '_all_rule_lines', None) else 0
             print(f"Ad blocker ready: {total_rules} source rules (incremental={worker.incremental_enabled})")
 
@@ -6073,7 +6951,7 @@ if __name__ == "__main__":
     args, unknown = parser.parse_known_args()
 
     # Create the shared worker pool before QApplication so threads are ready immediately
-    background_pool = IOPool(args.workers)
+    background_pool = _get_shared_io_pool(args.workers)
 
     # Trim custom args for Qt
     qt_argv = [sys.argv[0]] + [a for a in unknown]